@@ -0,0 +1,61 @@
+import os
+import tempfile
+import time
+from alation_dict import Dictionary, Record, Storage, StorageType
+
+"""
+Compares loading N records with distinct names through add() one at a time against add_many().
+
+add() rebuilds the fuzzy name cache every time a new name appears, so a first sync is O(N^2).
+add_many() rebuilds it once, so doubling N should roughly double its time while add() roughly
+quadruples.
+
+usage: python benchmarks/add_many.py
+"""
+
+def records(n: int) -> list[Record]:
+    return [
+        Record.model_construct(
+            id=i,
+            name=f"column_{i}",
+            title="title",
+            description="description",
+            url=f"https://alation.medcity.net/attribute/{i}/",
+            table_name=f"table_{i % 100}",
+            page_status="Approved",
+            phi=None,
+            pii=None
+        )
+        for i in range(n)
+    ]
+
+def timed(load, batch: list[Record], path: str) -> float:
+    dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, path))
+    start = time.perf_counter()
+    load(dictionary, batch)
+    return time.perf_counter() - start
+
+def one_at_a_time(dictionary: Dictionary, batch: list[Record]) -> None:
+    for record in batch:
+        dictionary.add(record)
+
+def bulk(dictionary: Dictionary, batch: list[Record]) -> None:
+    dictionary.add_many(batch)
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dictionary.json")
+        previous: tuple[float, float] | None = None
+
+        print(f"{'records':>8} {'add (s)':>10} {'add_many (s)':>14} {'add growth':>11} {'add_many growth':>16}")
+        for n in (2_500, 5_000, 10_000, 20_000):
+            batch = records(n)
+            add = timed(one_at_a_time, batch, path)
+            add_many = timed(bulk, batch, path)
+
+            growth = f"{add / previous[0]:>10.1f}x {add_many / previous[1]:>15.1f}x" if previous else ""
+            print(f"{n:>8} {add:>10.3f} {add_many:>14.3f} {growth}")
+            previous = (add, add_many)
+
+if __name__ == "__main__":
+    main()
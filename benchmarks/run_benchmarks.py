@@ -0,0 +1,133 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from alation_dict import Client, Dictionary, Endpoint, Storage, StorageType
+from alation_dict.stub import StubServer
+from synthetic import raw_columns, records
+
+"""
+Benchmark harness. Times storage, dictionary and client operations over synthetic datasets and
+writes the results to a json file so runs can be compared.
+
+usage:
+    python benchmarks/run_benchmarks.py --sizes 10000 100000 --output results.json
+    python benchmarks/run_benchmarks.py --output new.json --compare results.json --tolerance 0.25
+"""
+
+def timed(fn: Callable[[], Any], repeat: int = 1) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(size: int, crawl: bool, repeat: int) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+
+    def record(name: str, seconds: float, ops: int = 1) -> None:
+        results.append({"benchmark": name, "size": size, "seconds": seconds, "ops": ops, "per_op_us": seconds / ops * 1e6})
+        print(f"  {name:<28} {seconds:>10.4f}s  ({ops} ops, {seconds / ops * 1e6:,.1f} us/op)")
+
+    print(f"\n=== {size:,} records ===")
+    data = records(size)
+    rng = random.Random(size)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dictionary.json")
+        storage = Storage(StorageType.LOCAL_FILE, path)
+
+        record("storage_write", timed(lambda: storage.write(data), repeat))
+        record("storage_read", timed(lambda: sum(1 for _ in storage.read()), repeat))
+        record("dictionary_init", timed(lambda: Dictionary(storage), repeat))
+
+        empty = os.path.join(tmp, "empty.json")
+        record("dictionary_add_many", timed(lambda: Dictionary(Storage(StorageType.LOCAL_FILE, empty)).add_many(data), repeat), size)
+
+        dictionary = Dictionary(storage)
+        names = [r.name for r in rng.sample(data, min(size, 10_000))]
+        record("lookup", timed(lambda: [dictionary.lookup(n) for n in names], repeat), len(names))
+
+        queries = [n[:-1] + "x" for n in names[:100]]
+        record("fuzzy_lookup", timed(lambda: [dictionary.fuzzy_lookup(q, threshold=80) for q in queries], repeat), len(queries))
+
+        record("unique", timed(lambda: dictionary.unique(data), repeat))
+        record("export_records", timed(lambda: dictionary.export_records(data, os.path.join(tmp, "export.csv")), repeat))
+
+    if crawl:
+        columns = list(raw_columns(size))
+        with StubServer(columns, default_limit=1000) as stub:
+            sequential = Client("token", base_url=stub.url, page_size=1000)
+            record("client_get", timed(lambda: sum(1 for _ in sequential.get(Endpoint.COLUMN, {"limit": 1000})), repeat), size)
+
+            concurrent = Client("token", base_url=stub.url, max_workers=8, page_size=1000)
+            record("client_get_concurrent", timed(lambda: sum(1 for _ in concurrent.get(Endpoint.COLUMN)), repeat), size)
+
+    return results
+
+def compare(results: list[dict[str, Any]], baseline_path: str, tolerance: float) -> int:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["benchmark"], r["size"]): r for r in json.load(f)["results"]}
+
+    regressions = 0
+    print(f"\n=== compared to {baseline_path} (tolerance {tolerance:.0%}) ===")
+    for r in results:
+        before = baseline.get((r["benchmark"], r["size"]))
+        if before is None:
+            continue
+
+        change = r["seconds"] / before["seconds"] - 1 if before["seconds"] else 0
+        flag = "REGRESSION" if change > tolerance else ""
+        regressions += bool(flag)
+        print(f"  {r['benchmark']:<28} {r['size']:>9,} {change:>+8.1%} {flag}")
+
+    return regressions
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Times alation_dict operations over synthetic datasets")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=1, help="repeat each benchmark and keep the best time")
+    parser.add_argument("--no-crawl", action="store_true", help="skip Client.get crawls against the local stub")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="results file from a previous run to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="slowdown allowed before flagging a regression")
+    args = parser.parse_args()
+
+    results: list[dict[str, Any]] = []
+    for size in args.sizes:
+        results.extend(run(size, not args.no_crawl, args.repeat))
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "commit": git_commit(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"\nresults written to {args.output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.tolerance) else 0
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+import random
+from collections.abc import Iterator
+from typing import Any
+
+from alation_dict import Record
+
+"""
+Synthetic dataset generator for benchmarks. Produces Alation-shaped column objects (as returned by
+GET /integration/v2/column/) with realistic names, html descriptions and custom fields.
+"""
+
+WORDS = [
+    "patient", "admit", "discharge", "date", "dt", "id", "coid", "facility", "encounter", "type",
+    "code", "desc", "amount", "total", "charge", "payer", "plan", "provider", "npi", "dept",
+    "unit", "bed", "room", "status", "flag", "start", "end", "time", "ts", "mrn", "dx", "px",
+    "claim", "line", "service", "order", "lab", "result", "vital", "weight", "height", "source",
+]
+
+TEMPLATES = [
+    "<p>The {a} {b} recorded for the {c}.</p>",
+    "<p><b>{A}</b> {b} of the {c}, in local time.</p>",
+    "<p>Identifier of the {a} &amp; associated {b}.</p><p>Sourced from {c} feeds.</p>",
+    "{A} {b} {c}",
+    "<ul><li>{a}</li><li>{b}</li><li>{c}</li></ul>",
+]
+
+# boilerplate shared by many columns, as seen in real dictionaries
+BOILERPLATE = [
+    "<p>This column is populated by the nightly ETL. Contact the data governance team with questions.</p>",
+    "<p>Deprecated &ndash; do not use for new reporting.</p>",
+]
+
+def raw_columns(n: int, seed: int = 0) -> Iterator[dict[str, Any]]:
+    """
+    Yields n column objects. Names repeat across tables the way shared columns (coid, mrn...) do.
+    """
+    rng = random.Random(seed)
+    names = ["_".join(rng.sample(WORDS, rng.randint(1, 3))) for _ in range(max(1, n // 4))]
+    tables = [f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_{i}" for i in range(max(1, n // 50))]
+
+    for id in range(1, n + 1):
+        a, b, c = rng.sample(WORDS, 3)
+        description = (
+            rng.choice(BOILERPLATE) if rng.random() < 0.2
+            else rng.choice(TEMPLATES).format(a=a, b=b, c=c, A=a.title())
+        )
+
+        yield {
+            "id": id,
+            "name": rng.choice(names),
+            "title": f"{a.title()} {b.title()}",
+            "description": description,
+            "url": f"/attribute/{id}/",
+            "table_name": rng.choice(tables),
+            "custom_fields": [
+                {"field_id": 10030, "value": rng.choice(["Yes", "No"])},
+                {"field_id": 10031, "value": rng.choice(["Yes", "No"])},
+                {"field_id": 10045, "value": rng.choice(["Approved", "Draft", "In Review"])},
+            ],
+        }
+
+def records(n: int, seed: int = 0) -> list[Record]:
+    """
+    Validated records for n synthetic columns
+    """
+    return Record.validate_many(raw_columns(n, seed))
@@ -1,10 +1,11 @@
 from typing import Any
+from alation_dict.client import Client, Endpoint
 from alation_dict.record import Record
 from alation_dict.dictionary import Dictionary
 from alation_dict.storage import Storage, StorageType
 
 """
-Patches records with the specified values. This can be combined with the PATCH /integration/v2/column/ endpoint
+Patches records with the specified values. Client.patch sends them to the PATCH /integration/v2/column/ endpoint
 to perform "alignment" (ie column x is defined 10 different ways across multiple schemas and we want them all
 to have a consistent title and description)
 """
@@ -26,3 +27,14 @@ lookup_result = dictionary.lookup("coid")
 # title and description to what we have defined above
 for result in lookup_result:
     print(f"\nORIGINAL:\n{result}\n\nPATCHED:\n{Record.patch(result, changes)}\n")
+
+# preview the field level diffs, then send them. only fields that actually change are sent
+# and the dictionary is updated with the confirmed results
+client = Client("<YOUR_API_TOKEN>")
+patched = Record.patch_batch(lookup_result, changes)
+
+for patch in client.patch(Endpoint.COLUMN, patched, dictionary, dry_run=True):
+    print(patch.id, patch.changes)
+
+# client.patch(Endpoint.COLUMN, patched, dictionary)
+# dictionary.save()
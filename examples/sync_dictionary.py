@@ -0,0 +1,17 @@
+from alation_dict import Client, Dictionary, Endpoint, Storage, StorageType, sync
+
+"""
+Keeps the dictionary in sync with Alation. The first run crawls everything, later runs only pull
+columns modified since the previous run and remove columns that no longer exist.
+"""
+
+# auth info: https://developer.alation.com/dev/docs/authentication-into-alation-apis
+auth_token = "<YOUR_API_TOKEN>"
+
+client = Client(auth_token)
+storage = Storage(StorageType.LOCAL_FILE, "path/to/dictionary")
+dictionary = Dictionary(storage)
+
+# sync saves the dictionary and records the new high-water mark
+changes = sync(client, dictionary, Endpoint.COLUMN)
+print(f"added: {len(changes.added)}, updated: {len(changes.updated)}, removed: {len(changes.removed)}")
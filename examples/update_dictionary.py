@@ -9,11 +9,13 @@ Builds/updates the dictionary based on the records contained in the Alation API
 # auth info: https://developer.alation.com/dev/docs/authentication-into-alation-apis
 auth_token = "<YOUR_API_TOKEN>"
 
+# pass max_workers > 1 to fetch pages concurrently
 client = Client(auth_token)
 storage = Storage(StorageType.LOCAL_FILE, "path/to/dictionary")
 dictionary = Dictionary(storage)
 
-for record in client.get(Endpoint.COLUMN):
-    dictionary.add(record)
+# add_many rebuilds derived indexes once at the end instead of after every new record
+summary = dictionary.add_many(client.get(Endpoint.COLUMN))
+print(f"new: {summary.new}, updated: {summary.updated}, unchanged: {summary.unchanged}")
 
 dictionary.save()
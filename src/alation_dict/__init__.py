@@ -1,13 +1,48 @@
-from .client import Client, Endpoint
-from .dictionary import Dictionary
+from .alignment import AlignmentGroup
+from .async_client import AsyncClient
+from .cache import CacheMode, ResponseCache
+from .client import Client, Endpoint, Patch
+from .crawl import CrawlReport, Shard, ShardResult, crawl
+from .dictionary import AddSummary, Dictionary, FuzzyMatch, Not, SearchHit
+from .export import ExportFormat, export
+from .metrics import InMemoryCollector, PrometheusExporter
 from .record import Record
+from .service import LookupService, ServiceClient
+from .shared import SharedSnapshot
+from .snapshot import Snapshot
 from .storage import Storage, StorageType
+from .sync import ChangeSet, sync
+from .versioned import DictionaryView
 
 __all__ = [
+    "AddSummary",
+    "AlignmentGroup",
+    "AsyncClient",
+    "CacheMode",
+    "ChangeSet",
     "Client",
+    "CrawlReport",
     "Endpoint",
+    "ExportFormat",
     "Dictionary",
+    "DictionaryView",
+    "FuzzyMatch",
+    "InMemoryCollector",
+    "LookupService",
+    "Not",
+    "Patch",
+    "PrometheusExporter",
     "Record",
+    "ResponseCache",
+    "SearchHit",
+    "ServiceClient",
+    "Shard",
+    "ShardResult",
+    "SharedSnapshot",
+    "Snapshot",
     "Storage",
-    "StorageType"
+    "StorageType",
+    "crawl",
+    "export",
+    "sync"
 ]
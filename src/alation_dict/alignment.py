@@ -0,0 +1,192 @@
+import random
+import re
+import zlib
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .record import Record
+
+try:
+    import numpy as np  # pyright: ignore[reportMissingImports]
+except ImportError:  # optional, vectorizes minhash signatures
+    np = None
+
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+
+# each description in an lsh bucket is verified against at most this many clusters already in the
+# bucket, so buckets of boilerplate (thousands of copies of one description) stay linear
+MAX_BUCKET_CLUSTERS = 16
+
+# minhash permutations h(x) = (a * x + b) % P, seeded so signatures are stable across runs
+_P = (1 << 61) - 1
+_rng = random.Random(1331)
+_PERMUTATIONS: tuple[tuple[int, int], ...] = tuple(
+    (_rng.randrange(1, _P), _rng.randrange(0, _P)) for _ in range(NUM_PERM)
+)
+
+if np is not None:
+    # a is split in 30/31 bit halves so every product fits in 64 bits, see _signature_numpy
+    _A_HI = np.array([a >> 31 for a, _ in _PERMUTATIONS], dtype=np.uint64)[:, None]
+    _A_LO = np.array([a & ((1 << 31) - 1) for a, _ in _PERMUTATIONS], dtype=np.uint64)[:, None]
+    _B = np.array([b for _, b in _PERMUTATIONS], dtype=np.uint64)[:, None]
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+def normalize(text: str) -> str:
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+def name_key(name: str) -> str:
+    # "similar" names share a key, ex: admit_date, AdmitDate and ADMIT DATE
+    return normalize(name).replace(" ", "")
+
+def shingles(text: str) -> set[int]:
+    """
+    Hashed character shingles of the normalized text
+    """
+    text = normalize(text)
+    if len(text) <= SHINGLE_SIZE:
+        return {zlib.crc32(text.encode("utf-8"))}
+    return {zlib.crc32(text[i:i + SHINGLE_SIZE].encode("utf-8")) for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+def signature(text: str) -> tuple[int, ...]:
+    """
+    MinHash signature of the text's shingles. The fraction of equal positions between two
+    signatures estimates the Jaccard similarity of their shingle sets.
+    """
+    hashed = shingles(text)
+    if np is not None:
+        return _signature_numpy(hashed)
+    return tuple(min((a * x + b) % _P for x in hashed) for a, b in _PERMUTATIONS)
+
+def _signature_numpy(hashed: set[int]) -> tuple[int, ...]:
+    # exactly (a * x + b) % P for every permutation and shingle at once, so signatures match the
+    # pure python ones. a * x can reach 2^93, it is computed as (a_hi * x) * 2^31 + a_lo * x where
+    # multiplying by 2^31 mod the mersenne prime P = 2^61 - 1 is a rotation of the low 61 bits
+    if np is None:
+        raise Exception("vectorized signatures require numpy, install alation-dict[fast]")
+    x = np.fromiter(hashed, dtype=np.uint64, count=len(hashed))[None, :]
+    p = np.uint64(_P)
+
+    hi = (_A_HI * x) % p
+    hi = ((hi & np.uint64((1 << 30) - 1)) << np.uint64(31)) + (hi >> np.uint64(30))
+    values = (hi + (_A_LO * x) % p + _B) % p
+    return tuple(values.min(axis=1).tolist())
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+@dataclass
+class AlignmentGroup:
+    """
+    Records that share a (similar) name and are described almost, but not exactly, the same way.
+    """
+    name: str
+    records: list[Record]
+    descriptions: Counter[str]
+    similarity: float
+
+    @property
+    def canonical(self) -> str:
+        """
+        The most common description in the group, a reasonable default to align the others to
+        """
+        return self.descriptions.most_common(1)[0][0]
+
+    def patch(self, to: dict[str, str] | None = None) -> list[Record]:
+        """
+        Patched copies of every record in the group, aligned to the canonical description by default
+        """
+        return Record.patch_batch(self.records, to or {"description": self.canonical})
+
+class _DisjointSet:
+    def __init__(self, n: int):
+        self.parent: list[int] = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        self.parent[self.find(i)] = self.find(j)
+
+def alignment_candidates(records: Iterable[Record], threshold: float = 0.7) -> list[AlignmentGroup]:
+    """
+    Finds groups of records sharing a similar name whose descriptions are near duplicates.
+
+    Records are grouped by name, then the distinct descriptions in each group are clustered with
+    MinHash/LSH: descriptions only get compared when they collide in at least one band, so the work
+    grows with the number of records rather than the number of pairs. Groups are ranked by the number
+    of records they would align, then by how similar their descriptions are.
+
+    Note
+    ----
+    Signatures are computed with numpy when the 'fast' extra is installed, the result is the same.
+    """
+    by_name: defaultdict[str, list[Record]] = defaultdict(list)
+    for record in records:
+        if record.description:
+            by_name[name_key(record.name)].append(record)
+
+    # boilerplate descriptions repeat across names, so each one is only hashed once
+    signatures: dict[str, tuple[int, ...]] = {}
+    groups: list[AlignmentGroup] = []
+
+    for group in by_name.values():
+        descriptions = list(dict.fromkeys(r.description for r in group))
+        if len(descriptions) < 2:
+            continue
+
+        sigs = []
+        for description in descriptions:
+            if description not in signatures:
+                signatures[description] = signature(description)
+            sigs.append(signatures[description])
+
+        clusters = _DisjointSet(len(descriptions))
+        for band in range(BANDS):
+            buckets: defaultdict[tuple[int, ...], list[int]] = defaultdict(list)
+            for i, sig in enumerate(sigs):
+                buckets[sig[band * ROWS:(band + 1) * ROWS]].append(i)
+
+            # colliding descriptions are verified against the full signature before merging. each one
+            # is compared to one member per cluster already in the bucket rather than to every member
+            for bucket in buckets.values():
+                representatives: list[int] = []
+                for j in bucket:
+                    for i in representatives:
+                        if clusters.find(i) == clusters.find(j):
+                            break
+                        if similarity(sigs[i], sigs[j]) >= threshold:
+                            clusters.union(i, j)
+                            break
+                    else:
+                        if len(representatives) < MAX_BUCKET_CLUSTERS:
+                            representatives.append(j)
+
+        members: defaultdict[int, list[int]] = defaultdict(list)
+        for i in range(len(descriptions)):
+            members[clusters.find(i)].append(i)
+
+        for cluster in members.values():
+            if len(cluster) < 2:
+                continue
+
+            texts = {descriptions[i] for i in cluster}
+            matched = [r for r in group if r.description in texts]
+            score = min(similarity(sigs[cluster[0]], sigs[i]) for i in cluster[1:])
+
+            groups.append(AlignmentGroup(
+                name=Counter(r.name for r in matched).most_common(1)[0][0],
+                records=matched,
+                descriptions=Counter(r.description for r in matched),
+                similarity=score,
+            ))
+
+    groups.sort(key=lambda g: (-len(g.records), -g.similarity, g.name))
+    return groups
@@ -0,0 +1,232 @@
+import asyncio
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import metrics
+from .client import Endpoint
+from .record import Record
+
+# statuses that are worth retrying. anything else is raised immediately
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+class RateLimiter:
+    """
+    Token bucket rate limiter. Tokens refill continuously at 'rate' per second up to 'burst'
+    and every request consumes one token.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate: float = rate
+        self.burst: int = max(1, burst)
+        self._tokens: float = float(self.burst)
+        self._updated: float = time.monotonic()
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """
+        Waits until a token is available and consumes it
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+def retry_after(response: requests.Response) -> float | None:
+    """
+    Parses the Retry-After header, which may be either a number of seconds or an HTTP date
+    """
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+class AsyncClient:
+    """
+    asyncio API client for Alation endpoints.
+
+    Requests run on a pooled requests.Session in worker threads so the event loop is never
+    blocked and keep-alive connections are reused. Concurrency is capped by max_concurrency and,
+    optionally, a token bucket (rate_limit requests per second). 429/5xx responses and connection
+    errors are retried with jittered exponential backoff, honoring Retry-After when present.
+
+    Usage
+    -----
+    async with AsyncClient(auth_token) as client:
+        async for record in client.get(Endpoint.COLUMN):
+            ...
+    """
+
+    def __init__(
+        self,
+        auth_token: str,
+        base_url: str = "https://alation.medcity.net/",
+        max_concurrency: int = 4,
+        rate_limit: float | None = None,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        page_size: int = 100
+    ):
+        self.base_url: str = base_url
+        self.max_concurrency: int = max(1, max_concurrency)
+        self.max_retries: int = max_retries
+        self.backoff_base: float = backoff_base
+        self.backoff_cap: float = backoff_cap
+        self.page_size: int = page_size
+        self.limiter: RateLimiter | None = RateLimiter(rate_limit, self.max_concurrency) if rate_limit else None
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self.session: requests.Session = requests.Session()
+        self.session.headers.update({
+            "accept": "application/json",
+            "token": auth_token
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        self.session.close()
+
+    def _backoff(self, attempt: int, response: requests.Response | None) -> float:
+        # full jitter: sleep a random amount up to the exponential ceiling, but never
+        # less than what the server asked for
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        wait = retry_after(response) if response is not None else None
+        return max(delay, wait) if wait is not None else delay
+
+    def _request(self, url: str, params: dict[str, Any] | None) -> tuple[requests.Response, Any]:
+        start = time.perf_counter()
+        response = self.session.get(url=url, params=params, verify=False)
+        if response.status_code in RETRY_STATUSES:
+            metrics.inc("client_retries_total", status=response.status_code)
+            return response, None
+
+        response.raise_for_status()
+        metrics.observe("client_request_seconds", time.perf_counter() - start)
+        metrics.inc("client_pages_total")
+        if metrics.enabled():
+            metrics.inc("client_response_bytes_total", len(response.content))
+        return response, response.json()
+
+    async def _get(self, url: str, params: dict[str, Any] | None):
+        """
+        GET request boilerplate with rate limiting and retries
+        """
+        attempt = 0
+        while True:
+            if self.limiter:
+                await self.limiter.acquire()
+
+            try:
+                async with self._semaphore:
+                    response, body = await asyncio.to_thread(self._request, url, params)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt, None))
+                attempt += 1
+                continue
+
+            if response.status_code in RETRY_STATUSES:
+                if attempt >= self.max_retries:
+                    response.raise_for_status()
+                await asyncio.sleep(self._backoff(attempt, response))
+                attempt += 1
+                continue
+
+            next_page = response.headers.get("X-Next-Page")
+            next_page_url = urljoin(self.base_url, next_page) if next_page else None
+
+            return body, next_page_url
+
+    async def _get_integration_v2_column(self, params: dict[str, Any] | None = None):
+        """
+        GET request for the integration/v2/column/ endpoint. Pages are requested by limit/skip
+        ahead of the consumer, keeping at most max_concurrency pages outstanding. The crawl ends
+        on the server's last page (no next page, or an empty page), a short page only means the
+        server caps the page size below limit.
+        """
+        url = urljoin(self.base_url, "/integration/v2/column/")
+        params = dict(params or {})
+        limit = int(params.pop("limit", self.page_size))
+        skip = int(params.pop("skip", 0))
+
+        pending: deque[tuple[int, asyncio.Task[tuple[Any, str | None]]]] = deque()
+        next_skip = skip
+
+        def submit() -> None:
+            nonlocal next_skip
+            pending.append((next_skip, asyncio.create_task(self._get(url, {**params, "limit": limit, "skip": next_skip}))))
+            next_skip += limit
+
+        try:
+            for _ in range(self.max_concurrency):
+                submit()
+
+            while pending:
+                page_skip, task = pending.popleft()
+                page, next_page_url = await task
+
+                for record in page:
+                    yield Record(**record)
+
+                if next_page_url is None or not page:
+                    break
+
+                if len(page) < limit:
+                    # the server capped the page size, the pages requested ahead would leave gaps.
+                    # drop them and carry on from the end of this page with the server's size
+                    for _, task in pending:
+                        task.cancel()
+                    pending.clear()
+
+                    limit = len(page)
+                    next_skip = page_skip + limit
+                    for _ in range(self.max_concurrency):
+                        submit()
+                    continue
+
+                submit()
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def get(self, endpoint: Endpoint, params: dict[str, Any] | None = None) -> AsyncIterator[Record]:
+        """
+        GET request to endpoint
+        """
+        match endpoint:
+            case Endpoint.COLUMN:
+                async for record in self._get_integration_v2_column(params or endpoint.value):
+                    yield record
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Any
+from urllib.parse import urlparse
+
+class CacheMode(Enum):
+    """
+    REVALIDATE sends If-None-Match/If-Modified-Since for cached pages and stores every response,
+    which also records the crawl. REPLAY never touches the network and serves only what was recorded.
+    """
+    REVALIDATE = 0
+    REPLAY = 1
+
+@dataclass
+class CacheEntry:
+    """
+    A cached page. 'page' holds validated records (model_dump) when validated is True, so serving
+    it skips Record validation, otherwise the raw objects returned by the API.
+    """
+    page: list[dict[str, Any]]
+    validated: bool
+    next_page: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def validators(self) -> dict[str, str]:
+        """
+        Conditional request headers for revalidating this entry
+        """
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """
+    On-disk cache of GET responses, one json file per page in 'directory'.
+
+    Entries are keyed by the request path and params but not the host, so a crawl recorded against
+    Alation can be replayed against any base url (ex: the local stub).
+
+    Usage
+    -----
+    client = Client(token, cache=ResponseCache(".alation-cache"))                           # record / revalidate
+    client = Client(token, cache=ResponseCache(".alation-cache", mode=CacheMode.REPLAY))    # offline
+    """
+
+    def __init__(self, directory: str, mode: CacheMode = CacheMode.REVALIDATE):
+        self.directory: str = directory
+        self.mode: CacheMode = mode
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(url: str, params: dict[str, Any] | None) -> str:
+        parsed = urlparse(url)
+        # 'next page' urls carry their params in the query string, normalize both forms the same way
+        query = sorted((params or {}).items())
+        raw = json.dumps([parsed.path, parsed.query, [(k, str(v)) for k, v in query]])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, url: str, params: dict[str, Any] | None) -> CacheEntry | None:
+        try:
+            with open(self._path(self.key(url, params)), "r", encoding="utf-8") as f:
+                return CacheEntry(**json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def put(self, url: str, params: dict[str, Any] | None, entry: CacheEntry) -> None:
+        path = self._path(self.key(url, params))
+        # pages are fetched concurrently, keep temp files apart per thread
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(entry), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
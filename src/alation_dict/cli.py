@@ -0,0 +1,87 @@
+import json
+
+import click
+
+from .export import ExportFormat
+from .service import DEFAULT_HOST, DEFAULT_PORT, LookupService, ServiceClient
+from .storage import Storage, StorageType
+
+def connection_options(fn):
+    fn = click.option("--socket", "socket_path", help="unix socket the service listens on")(fn)
+    fn = click.option("--url", default=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}/", show_default=True, help="service url")(fn)
+    return fn
+
+@click.group()
+def main() -> None:
+    """
+    Serve and query a resident alation_dict Dictionary
+    """
+
+@main.command()
+@click.argument("path")
+@click.option("--type", "storage_type", type=click.Choice(["local_file", "db"]), default="local_file", show_default=True)
+@click.option("--journal", is_flag=True, help="storage is journaled")
+@click.option("--host", default=DEFAULT_HOST, show_default=True)
+@click.option("--port", default=DEFAULT_PORT, show_default=True)
+@click.option("--socket", "socket_path", help="listen on a unix socket instead of host:port")
+@click.option("--poll-interval", default=1.0, show_default=True, help="seconds between checks for storage changes")
+@click.option("--compact", is_flag=True, help="store records column-wise to save memory")
+def serve(
+    path: str,
+    storage_type: str,
+    journal: bool,
+    host: str,
+    port: int,
+    socket_path: str | None,
+    poll_interval: float,
+    compact: bool
+) -> None:
+    """
+    Loads the dictionary at PATH and serves lookups until interrupted
+    """
+    storage = Storage(StorageType[storage_type.upper()], path, journal=journal)
+    with LookupService(storage, host, port, socket_path, poll_interval, compact) as service:
+        click.echo(f"serving {service.health()['records']} records on {service.url}", err=True)
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+@main.command()
+@click.argument("name")
+@click.option("--fuzzy", is_flag=True, help="fuzzy match the name")
+@click.option("--threshold", default=80, show_default=True, help="minimum fuzzy match score")
+@connection_options
+def lookup(name: str, fuzzy: bool, threshold: int, url: str, socket_path: str | None) -> None:
+    """
+    Prints the records matching NAME, one json object per line
+    """
+    with ServiceClient(url, socket_path) as client:
+        records = client.fuzzy_lookup(name, threshold) if fuzzy else client.lookup(name)
+
+    for record in records:
+        click.echo(json.dumps(record.model_dump(), ensure_ascii=False))
+
+@main.command()
+@click.argument("path")
+@click.option("--format", "format", type=click.Choice(["csv", "ndjson"]), default="ndjson", show_default=True)
+@click.option("--columns", help="comma separated columns to export, all by default")
+@connection_options
+def export(path: str, format: str, columns: str | None, url: str, socket_path: str | None) -> None:
+    """
+    Exports the served dictionary to PATH
+    """
+    with ServiceClient(url, socket_path) as client:
+        client.export(path, ExportFormat[format.upper()], columns.split(",") if columns else None)
+
+@main.command()
+@connection_options
+def health(url: str, socket_path: str | None) -> None:
+    """
+    Prints the service's record count and reload status
+    """
+    with ServiceClient(url, socket_path) as client:
+        click.echo(json.dumps(client.health()))
+
+if __name__ == "__main__":
+    main()
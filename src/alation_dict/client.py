@@ -1,8 +1,12 @@
 from enum import Enum
 import json
-from collections.abc import Iterator
-from typing import Any
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, NamedTuple
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urljoin
 
 # this serves only to suppress requests warnings
@@ -11,7 +15,17 @@ from urllib.parse import urljoin
 import warnings
 warnings.filterwarnings("ignore")
 
-from .record import Record
+from . import metrics
+from .cache import CacheEntry, CacheMode, ResponseCache
+from .jsonstream import iter_array
+from .record import CUSTOM_FIELD_ID_MAP, Record
+
+if TYPE_CHECKING:
+    from .dictionary import Dictionary
+
+# fields that can be changed through PATCH, custom fields are sent by field id
+PATCHABLE_FIELDS: tuple[str, ...] = ("title", "description", *CUSTOM_FIELD_ID_MAP.values())
+CUSTOM_FIELD_NAME_MAP: dict[str, int] = {name: id for id, name in CUSTOM_FIELD_ID_MAP.items()}
 
 class Endpoint(Enum):
     """
@@ -28,6 +42,30 @@ class Endpoint(Enum):
         )
     }
 
+class Patch(NamedTuple):
+    """
+    Field level diff for a single record: field -> (current value, patched value)
+    """
+    id: int
+    changes: dict[str, tuple[Any, Any]]
+
+    def payload(self) -> dict[str, Any]:
+        """
+        Request body for this patch, custom fields are sent as a list of field id/value pairs
+        """
+        body: dict[str, Any] = {"id": self.id}
+        custom_fields = []
+
+        for field, (_, value) in self.changes.items():
+            if field in CUSTOM_FIELD_NAME_MAP:
+                custom_fields.append({"field_id": CUSTOM_FIELD_NAME_MAP[field], "value": value})
+            else:
+                body[field] = value
+
+        if custom_fields:
+            body["custom_fields"] = custom_fields
+        return body
+
 class Client:
     """
     API client for Alation endpoints.
@@ -36,32 +74,120 @@ class Client:
     ----
     Client requires authentication via API or Refresh token
     Authentication info: https://developer.alation.com/dev/docs/authentication-into-alation-apis
+
+    Concurrency
+    -----------
+    By default pages are fetched one at a time by following X-Next-Page. When max_workers > 1
+    the crawl is split into limit/skip pages which are fetched on a bounded worker pool. At most
+    max_workers requests are in flight at once and records are still yielded in page order.
+
+    Cache
+    -----
+    With a ResponseCache every page is stored on disk along with its ETag/Last-Modified validators.
+    Later requests for the same page are sent conditionally and a 304 reuses the cached, already
+    validated records. In CacheMode.REPLAY pages are only ever served from the cache.
     """
 
-    def __init__(self, auth_token: str):
-        self.base_url: str = "https://alation.medcity.net/"
+    def __init__(
+        self,
+        auth_token: str,
+        base_url: str = "https://alation.medcity.net/",
+        max_workers: int = 1,
+        page_size: int = 100,
+        cache: ResponseCache | None = None
+    ):
+        self.auth_token: str = auth_token
+        self.base_url: str = base_url
+        self.max_workers: int = max(1, max_workers)
+        self.page_size: int = page_size
+        self.cache: ResponseCache | None = cache
         self.session: requests.Session = requests.Session()
         self.session.headers.update({
             "accept": "application/json",
-            "token": auth_token
+            "token": self.auth_token
         })
 
-    def _get(self, url: str, params: dict[str, Any] | None):
+        # size the connection pool to match the worker pool so concurrent
+        # requests reuse keep-alive connections instead of opening new ones
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _get(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        stream: bool = False,
+        headers: dict[str, str] | None = None
+    ):
         """
         GET request boilerplate
         """
+        start = perf_counter()
         response = self.session.get(
             url=url,
             params=params,
-            verify=False
+            headers=headers,
+            verify=False,
+            stream=stream
         )
 
         response.raise_for_status()
 
-        next_page = response.headers.get("X-Next-Page")
-        next_page_url = urljoin(self.base_url, next_page) if next_page else None
+        # streamed bodies are still arriving, so this is time to headers. bytes are
+        # reported once the body has been read, see _observe_body
+        metrics.observe("client_request_seconds", perf_counter() - start)
+        metrics.inc("client_pages_total")
+
+        return response, self._next_page_url(response.headers.get("X-Next-Page"))
+
+    def _next_page_url(self, next_page: str | None) -> str | None:
+        return urljoin(self.base_url, next_page) if next_page else None
+
+    def _get_cached(self, url: str, params: dict[str, Any] | None, validate: bool) -> tuple[CacheEntry, str | None]:
+        """
+        GET request through the response cache. With validate=True the page is stored as validated
+        records, so serving it again (after a 304 or in replay) skips Record validation.
+        """
+        if self.cache is None:
+            raise Exception("client has no response cache, pass cache=ResponseCache(...)")
+        cached = self.cache.get(url, params)
+
+        if self.cache.mode is CacheMode.REPLAY:
+            if cached is None:
+                raise Exception(f"no recorded response for {url} {params or ''}")
+            metrics.inc("client_cache_requests_total", result="replay")
+            return cached, self._next_page_url(cached.next_page)
+
+        response, next_page_url = self._get(url, params, headers=cached.validators() if cached else None)
 
-        return response, next_page_url
+        if response.status_code == 304 and cached is not None:
+            metrics.inc("client_cache_requests_total", result="hit")
+            return cached, self._next_page_url(cached.next_page)
+
+        self._observe_body(response)
+        page = response.json()
+        entry = CacheEntry(
+            page=[r.model_dump() for r in Record.validate_many(page)] if validate else page,
+            validated=validate,
+            next_page=response.headers.get("X-Next-Page"),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        self.cache.put(url, params, entry)
+        metrics.inc("client_cache_requests_total", result="miss")
+
+        return entry, next_page_url
+
+    def _get_cached_records(self, url: str, params: dict[str, Any] | None) -> tuple[list[Record], str | None]:
+        entry, next_page_url = self._get_cached(url, params, validate=True)
+        return [Record.model_construct(**r) for r in entry.page], next_page_url
+
+    @staticmethod
+    def _observe_body(response: requests.Response, streamed: bool = False) -> None:
+        if metrics.enabled():
+            # streamed bodies were never buffered, raw.tell() counts the bytes read off the wire
+            metrics.inc("client_response_bytes_total", response.raw.tell() if streamed else len(response.content))
 
     def _get_integration_v2_column(self, params: dict[str, Any] | None = None):
         """
@@ -71,11 +197,225 @@ class Client:
         url = urljoin(self.base_url, "/integration/v2/column/")
 
         while url:
-            response, url = self._get(url, params)
+            if self.cache is not None:
+                records, url = self._get_cached_records(url, params)
+                params = None
+                yield from records
+                continue
+
+            response, url = self._get(url, params, stream=True)
             params = None   # params are already present in 'next page' urls
 
-            for record in response.json():
-                yield Record(**record)
+            # decode the body as it arrives instead of buffering the whole page, so
+            # memory stays flat and validation overlaps with the download
+            response.encoding = response.encoding or "utf-8"
+            with response:
+                records = iter_array(response.iter_content(chunk_size=64 * 1024, decode_unicode=True))
+
+                if not metrics.enabled():
+                    for record in records:
+                        yield Record(**record)
+                    continue
+
+                # validation is interleaved with the download, so only time spent in Record() is counted
+                count, validating = 0, 0.0
+                for record in records:
+                    start = perf_counter()
+                    validated = Record(**record)
+                    validating += perf_counter() - start
+                    count += 1
+                    yield validated
+
+                self._observe_body(response, streamed=True)
+                metrics.validated(count, validating)
+
+    def _get_page(self, url: str, params: dict[str, Any]) -> tuple[list[Record], bool]:
+        """
+        Fetches and validates a single page. Returns the records along with a flag
+        indicating whether the server reported another page.
+        """
+        if self.cache is not None:
+            records, next_page_url = self._get_cached_records(url, params)
+            return records, next_page_url is not None
+
+        response, next_page_url = self._get(url, params)
+        self._observe_body(response)
+        return Record.validate_many(response.json()), next_page_url is not None
+
+    def _get_integration_v2_column_concurrent(self, params: dict[str, Any] | None = None):
+        """
+        Concurrent GET request for the integration/v2/column/ endpoint. Pages are requested
+        by limit/skip ahead of the consumer, keeping at most max_workers requests in flight.
+        The crawl ends on the server's last page (no next page, or an empty page), a short
+        page only means the server caps the page size below limit.
+        """
+        url = urljoin(self.base_url, "/integration/v2/column/")
+        params = dict(params or {})
+        limit = int(params.pop("limit", self.page_size))
+        skip = int(params.pop("skip", 0))
+
+        pending: deque[tuple[int, Future[tuple[list[Record], bool]]]] = deque()
+        next_skip = skip
+
+        def submit() -> None:
+            nonlocal next_skip
+            pending.append((next_skip, pool.submit(self._get_page, url, {**params, "limit": limit, "skip": next_skip})))
+            next_skip += limit
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            try:
+                for _ in range(self.max_workers):
+                    submit()
+
+                # pages are consumed in submission order, so records come out in
+                # the same order as a sequential crawl
+                while pending:
+                    page_skip, future = pending.popleft()
+                    page, has_next = future.result()
+
+                    yield from page
+
+                    if not has_next or not page:
+                        break
+
+                    if len(page) < limit:
+                        # the server capped the page size, the pages requested ahead would leave gaps.
+                        # drop them and carry on from the end of this page with the server's size
+                        for _, future in pending:
+                            future.cancel()
+                        pending.clear()
+
+                        limit = len(page)
+                        next_skip = page_skip + limit
+                        for _ in range(self.max_workers):
+                            submit()
+                        continue
+
+                    submit()
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    def _patch(self, url: str, body: list[dict[str, Any]]) -> requests.Response:
+        """
+        PATCH request boilerplate
+        """
+        response = self.session.patch(
+            url=url,
+            json=body,
+            verify=False
+        )
+
+        response.raise_for_status()
+        return response
+
+    def _patch_integration_v2_column(self, patches: list[Patch], batch_size: int) -> Iterator[list[Patch]]:
+        """
+        PATCH request for the integration/v2/column/ endpoint. Patches are sent in bulk payloads of
+        batch_size on the worker pool and each batch is yielded once the server has confirmed it.
+        Failed batches don't stop the others, they are all reported together once every confirmed
+        batch has been yielded.
+        """
+        url = urljoin(self.base_url, "/integration/v2/column/")
+        batches = [patches[i:i + batch_size] for i in range(0, len(patches), batch_size)]
+        failed: list[str] = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self._patch, url, [p.payload() for p in batch]) for batch in batches]
+
+            for i, (batch, future) in enumerate(zip(batches, futures)):
+                try:
+                    future.result()
+                except Exception as e:
+                    failed.append(f"batch {i} (ids {batch[0].id}..{batch[-1].id}): {e}")
+                    continue
+                yield batch
+
+        if failed:
+            raise Exception(f"{len(failed)} of {len(batches)} patch batches failed, the rest were applied: " + "; ".join(failed))
+
+    def patch(
+        self,
+        endpoint: Endpoint,
+        records: Iterable[Record],
+        dictionary: "Dictionary",
+        dry_run: bool = False,
+        batch_size: int = 100
+    ) -> list[Patch]:
+        """
+        PATCH records to endpoint.
+
+        Each record is diffed field by field against its current entry in the dictionary and records with
+        no changes are skipped. The remaining patches are sent in bulk payloads of batch_size, up to
+        max_workers at a time, and every confirmed batch is applied back into the dictionary so no re-fetch
+        is needed. With dry_run=True nothing is sent and the diffs are only returned.
+
+        If some batches fail the confirmed ones are still applied, then an exception listing the failed
+        batches is raised. Patching the same records again only resends what didn't go through.
+
+        Usage
+        -----
+        patches = client.patch(Endpoint.COLUMN, Record.patch_batch(dictionary.lookup("coid"), changes), dictionary)
+        """
+        patched: dict[int, Record] = {}
+        patches: list[Patch] = []
+
+        for record in records:
+            current = dictionary.index.get(record.id)
+
+            if current is not None:
+                unsupported = [
+                    field for field in Record.model_fields
+                    if field not in PATCHABLE_FIELDS and getattr(current, field) != getattr(record, field)
+                ]
+                if unsupported:
+                    raise Exception(f"cannot patch fields {unsupported} on record {record.id}")
+
+            changes = {
+                field: (getattr(current, field) if current else None, getattr(record, field))
+                for field in PATCHABLE_FIELDS
+                if current is None or getattr(current, field) != getattr(record, field)
+            }
+            if changes:
+                patches.append(Patch(record.id, changes))
+                patched[record.id] = record
+
+        if dry_run or not patches:
+            return patches
+
+        match endpoint:
+            case Endpoint.COLUMN:
+                confirmed = self._patch_integration_v2_column(patches, batch_size)
+
+        with dictionary.batch():
+            for batch in confirmed:
+                for patch in batch:
+                    dictionary.add(patched[patch.id])
+
+        return patches
+
+    def get_ids(self, endpoint: Endpoint, params: dict[str, Any] | None = None) -> Iterator[int]:
+        """
+        Lists only the ids matching the endpoint's filters. Much cheaper than a full GET
+        since only the id field is returned and no Records are built.
+        """
+        match endpoint:
+            case Endpoint.COLUMN:
+                url = urljoin(self.base_url, "/integration/v2/column/")
+                page_params: dict[str, Any] | None = {**(params or endpoint.value), "fields": "id"}
+
+                while url:
+                    if self.cache is not None:
+                        entry, url = self._get_cached(url, page_params, validate=False)
+                        page = entry.page
+                    else:
+                        response, url = self._get(url, page_params)
+                        self._observe_body(response)
+                        page = response.json()
+                    page_params = None   # params are already present in 'next page' urls
+
+                    for column in page:
+                        yield column["id"]
 
     def get(self, endpoint: Endpoint, params: dict[str, Any] | None = None) -> Iterator[Record]:
         """
@@ -84,6 +424,8 @@ class Client:
         # this pattern makes it easy to support more endpoints in the future (ex we want to
         # fetch data quality rules from Alation)
         match endpoint:
+            case Endpoint.COLUMN if self.max_workers > 1:
+                yield from self._get_integration_v2_column_concurrent(params or endpoint.value)
             case Endpoint.COLUMN:
                 yield from self._get_integration_v2_column(params or endpoint.value)
             # case Endpoint.ANOTHER:
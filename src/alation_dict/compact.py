@@ -0,0 +1,133 @@
+import sys
+from array import array
+from collections.abc import Iterator, MutableMapping
+
+from .record import Record
+
+class _Codes:
+    """
+    Dictionary encoded column. Each distinct value is stored once and rows hold a 4 byte code.
+    Meant for low cardinality values like table_name, phi, pii and page_status.
+    """
+
+    def __init__(self):
+        self.values: list[str | None] = []
+        self.lookup: dict[str | None, int] = {}
+        self.codes: array[int] = array("I")
+
+    def encode(self, value: str | None) -> int:
+        code = self.lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.lookup[value] = code
+        return code
+
+    def append(self, value: str | None) -> None:
+        self.codes.append(self.encode(value))
+
+    def __getitem__(self, row: int) -> str | None:
+        return self.values[self.codes[row]]
+
+    def __setitem__(self, row: int, value: str | None) -> None:
+        self.codes[row] = self.encode(value)
+
+def _split_url(url: str) -> tuple[str, str]:
+    # record urls only differ in their last path segment (ex: https://host/attribute/123/)
+    # so the prefix is dictionary encoded and only the tail is stored per row
+    cut = url.rfind("/", 0, len(url) - 1) + 1
+    return url[:cut], url[cut:]
+
+class CompactIndex(MutableMapping[int, Record]):
+    """
+    Columnar id -> Record mapping used by Dictionary(compact=True).
+
+    Records are not kept as objects. Each field is stored in its own column: ids in an int
+    array, free text as interned strings and low cardinality values dictionary encoded, plus an
+    id -> row offset map. Lightweight Record views are built only when a record is read.
+    """
+
+    def __init__(self):
+        self._rows: dict[int, int] = {}
+        self._ids: array[int] = array("q")
+        self._name: list[str] = []
+        self._title: list[str] = []
+        self._description: list[str] = []
+        self._url_prefix: _Codes = _Codes()
+        self._url_tail: list[str] = []
+        self._table_name: _Codes = _Codes()
+        self._page_status: _Codes = _Codes()
+        self._phi: _Codes = _Codes()
+        self._pii: _Codes = _Codes()
+
+    def _view(self, row: int) -> Record:
+        return Record.model_construct(
+            id=self._ids[row],
+            name=self._name[row],
+            title=self._title[row],
+            description=self._description[row],
+            url=f"{self._url_prefix[row]}{self._url_tail[row]}",
+            table_name=self._table_name[row],
+            page_status=self._page_status[row],
+            phi=self._phi[row],
+            pii=self._pii[row],
+        )
+
+    def __getitem__(self, id: int) -> Record:
+        return self._view(self._rows[id])
+
+    def __setitem__(self, id: int, record: Record) -> None:
+        prefix, tail = _split_url(record.url)
+        row = self._rows.get(id)
+
+        if row is None:
+            self._rows[id] = len(self._ids)
+            self._ids.append(id)
+            self._name.append(sys.intern(record.name))
+            self._title.append(sys.intern(record.title))
+            self._description.append(sys.intern(record.description))
+            self._url_prefix.append(prefix)
+            self._url_tail.append(tail)
+            self._table_name.append(record.table_name)
+            self._page_status.append(record.page_status)
+            self._phi.append(record.phi)
+            self._pii.append(record.pii)
+            return
+
+        self._name[row] = sys.intern(record.name)
+        self._title[row] = sys.intern(record.title)
+        self._description[row] = sys.intern(record.description)
+        self._url_prefix[row] = prefix
+        self._url_tail[row] = tail
+        self._table_name[row] = record.table_name
+        self._page_status[row] = record.page_status
+        self._phi[row] = record.phi
+        self._pii[row] = record.pii
+
+    def __delitem__(self, id: int) -> None:
+        # move the last row into the hole so the columns stay dense
+        row = self._rows.pop(id)
+        last = len(self._ids) - 1
+
+        if row != last:
+            self._rows[self._ids[last]] = row
+            self._ids[row] = self._ids[last]
+            for column in (self._name, self._title, self._description, self._url_tail):
+                column[row] = column[last]
+            for codes in (self._url_prefix, self._table_name, self._page_status, self._phi, self._pii):
+                codes.codes[row] = codes.codes[last]
+
+        self._ids.pop()
+        for column in (self._name, self._title, self._description, self._url_tail):
+            column.pop()
+        for codes in (self._url_prefix, self._table_name, self._page_status, self._phi, self._pii):
+            codes.codes.pop()
+
+    def __contains__(self, id: object) -> bool:
+        return id in self._rows
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
@@ -0,0 +1,135 @@
+import os
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+
+from .client import Client, Endpoint
+from .dictionary import AddSummary, Dictionary
+from .record import Record
+
+# filters restricting a column crawl to a range of table ids, [start, stop)
+TABLE_ID_FROM_PARAM = "table_id__gte"
+TABLE_ID_TO_PARAM = "table_id__lt"
+
+class Shard(NamedTuple):
+    """
+    A slice of the crawl: one datasource, optionally limited to a range of table ids [start, stop)
+    """
+    ds_id: int
+    table_ids: tuple[int, int] | None = None
+
+    def params(self, base: dict[str, Any]) -> dict[str, Any]:
+        params = {**base, "ds_id": self.ds_id}
+        if self.table_ids is not None:
+            params[TABLE_ID_FROM_PARAM], params[TABLE_ID_TO_PARAM] = self.table_ids
+        return params
+
+    @classmethod
+    def split(cls, ds_id: int, start: int, stop: int, parts: int) -> list["Shard"]:
+        """
+        Splits a large datasource into 'parts' shards covering table ids [start, stop)
+        """
+        step = max(1, -(-(stop - start) // parts))
+        return [cls(ds_id, (lo, min(lo + step, stop))) for lo in range(start, stop, step)]
+
+@dataclass
+class ShardResult:
+    """
+    Outcome of crawling one shard. fetch_seconds covers the requests and Record validation
+    done in the worker, merge_seconds the time spent adding the shard to the dictionary.
+    """
+    shard: Shard
+    records: int = 0
+    fetch_seconds: float = 0.0
+    merge_seconds: float = 0.0
+    error: str | None = None
+
+@dataclass
+class CrawlReport:
+    shards: list[ShardResult] = field(default_factory=list)
+    summary: AddSummary = field(default_factory=AddSummary)
+    seconds: float = 0.0
+
+    @property
+    def failed(self) -> list[ShardResult]:
+        return [s for s in self.shards if s.error is not None]
+
+    @property
+    def records(self) -> int:
+        return sum(s.records for s in self.shards)
+
+class _ClientConfig(NamedTuple):
+    # what a worker process needs to build its own Client, sessions aren't shared across processes
+    auth_token: str
+    base_url: str
+    max_workers: int
+    page_size: int
+    record_base_url: str
+
+def _fetch_shard(config: _ClientConfig, shard: Shard, params: dict[str, Any]) -> tuple[list[Record], float]:
+    Record.base_url = config.record_base_url
+    client = Client(config.auth_token, config.base_url, config.max_workers, config.page_size)
+
+    start = time.perf_counter()
+    records = list(client.get(Endpoint.COLUMN, shard.params(params)))
+    return records, time.perf_counter() - start
+
+def crawl(
+    client: Client,
+    dictionary: Dictionary,
+    shards: Iterable[Shard | int],
+    params: dict[str, Any] | None = None,
+    processes: int | None = None,
+    progress: Callable[[ShardResult], None] | None = None
+) -> CrawlReport:
+    """
+    Crawls many datasources (or table id ranges within one) in parallel and merges them into the dictionary.
+
+    Each shard is fetched in a worker process with its own Client, so the CPU heavy part of a crawl
+    (json decoding and description cleaning during Record validation) runs on every core rather than
+    one. Shards are merged as they finish inside a single dictionary batch, so derived indexes are
+    built once at the end. The dictionary is not saved.
+
+    Note
+    ----
+    Plain ints are treated as whole datasources. A failed shard does not stop the crawl, it is
+    reported with its error in CrawlReport.failed. progress is called in this process with each
+    shard's result once it has been merged.
+
+    Usage
+    -----
+    report = crawl(client, dictionary, [15, 16, *Shard.split(17, 0, 40_000, parts=8)], progress=print)
+    """
+    config = _ClientConfig(client.auth_token, client.base_url, client.max_workers, client.page_size, Record.base_url)
+    params = dict(params or Endpoint.COLUMN.value)
+    shards = [Shard(s) if isinstance(s, int) else s for s in shards]
+    report = CrawlReport()
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=processes or min(len(shards), os.cpu_count() or 1) or 1) as pool:
+        futures = {pool.submit(_fetch_shard, config, shard, params): shard for shard in shards}
+
+        with dictionary.batch() as summary:
+            for future in as_completed(futures):
+                result = ShardResult(futures[future])
+
+                try:
+                    records, result.fetch_seconds = future.result()
+                except Exception as e:
+                    result.error = f"{type(e).__name__}: {e}"
+                else:
+                    merge_start = time.perf_counter()
+                    for record in records:
+                        dictionary.add(record)
+                    result.records = len(records)
+                    result.merge_seconds = time.perf_counter() - merge_start
+
+                report.shards.append(result)
+                if progress is not None:
+                    progress(result)
+
+    report.summary = summary
+    report.seconds = time.perf_counter() - start
+    return report
@@ -1,32 +1,161 @@
-import csv
-from rapidfuzz import fuzz, process
+from rapidfuzz import fuzz, process, utils
 from collections import defaultdict
+from collections.abc import Iterable, Iterator, MutableMapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Literal, NamedTuple
 
+from . import metrics
+from .alignment import AlignmentGroup, alignment_candidates
+from .compact import CompactIndex
+from .export import ExportFormat, export
+from .ngram import TrigramIndex
+from .search import TextIndex
+from .shared import SharedSnapshot
 from .record import Record
-from .storage import Storage
+from .storage import Storage, StorageType
+from .versioned import DictionaryView
+
+try:
+    import numpy as np  # pyright: ignore[reportMissingImports]
+except ImportError:  # optional, enables multi-core matrix scoring in fuzzy_lookup_many
+    np = None
+
+AddOutcome = Literal["new", "updated", "unchanged"]
+
+# low cardinality fields with a secondary index (value -> ids), used by Dictionary.query
+INDEXED_FIELDS: tuple[str, ...] = ("table_name", "page_status", "phi", "pii")
+
+class Not(NamedTuple):
+    """
+    Negates a Dictionary.query filter, ex: query(page_status=Not("Approved"))
+    """
+    value: Any
+
+# fuzzy_lookup scores at most this many trigram candidates, and scans every name
+# when the trigram index turns up fewer than MIN_FUZZY_CANDIDATES
+MAX_FUZZY_CANDIDATES = 256
+MIN_FUZZY_CANDIDATES = 16
+
+# upper bound on the size of the score matrix computed at once by fuzzy_lookup_many
+MAX_SCORE_MATRIX_BYTES = 256 * 1024 * 1024
+
+class SearchHit(NamedTuple):
+    """
+    A single search result: the record and its BM25 score
+    """
+    record: Record
+    score: float
+
+class FuzzyMatch(NamedTuple):
+    """
+    A single fuzzy_lookup_many match: the matched name, its score and the records sharing that name
+    """
+    name: str
+    score: float
+    records: list[Record]
+
+@dataclass
+class AddSummary:
+    """
+    Counts of what happened to the records passed to Dictionary.add_many (or added inside Dictionary.batch)
+    """
+    new: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def count(self, outcome: AddOutcome) -> None:
+        setattr(self, outcome, getattr(self, outcome) + 1)
 
 class Dictionary:
     """
     Converts records into a dictionary. The resulting dictionary is basically a fancy hashmap.
     The main responsibility is to make records "searchable" - methods are provided for performing both direct and fuzzy searches.
+
+    Note
+    ----
+    Pass compact=True to store records column-wise (see CompactIndex) instead of one Record object per
+    column. This trades a little lookup time for a much smaller memory footprint on large dictionaries.
+
+    Pass lazy=True to defer building the fuzzy search name cache until the first fuzzy_lookup, so
+    processes that only do direct lookups never pay for it.
+
+    The dictionary itself is not safe to read while another thread writes to it. Pass versioned=True
+    to have every add/remove (or batch of them) publish an immutable DictionaryView, then read from
+    snapshot() in other threads while a sync runs. Publishing copies only the index buckets a batch
+    touched, records are shared between versions.
     """
 
-    def __init__(self, storage: Storage):
+    def __init__(self, storage: Storage, compact: bool = False, lazy: bool = False, versioned: bool = False):
+        if compact and versioned:
+            raise Exception("a compact dictionary can't be versioned, views hold Record objects")
+
         self.storage: Storage = storage
-        self.index: dict[int, Record] = {}
+        self.lazy: bool = lazy
+        self.versioned: bool = versioned
+        self.index: MutableMapping[int, Record] = CompactIndex() if compact else {}
         self.name_index: defaultdict[str, set[int]] = defaultdict(set)
+        self.field_index: dict[str, defaultdict[str | None, set[int]]] = {
+            field: defaultdict(set) for field in INDEXED_FIELDS
+        }
+
+        # while a batch is open derived structures (the name cache) are rebuilt once at the end
+        self._batch_depth: int = 0
+        self._batch_summary: AddSummary | None = None
+
+        self._name_cache: tuple[str, ...] | None = None
+        self._processed_name_cache: tuple[str, ...] | None = None
+        self._grams: TrigramIndex | None = None
+        self._text: TextIndex | None = None
 
         # there are 2 indexes that we need
         # one by id (which is unqiue) and another by name to provide natural searching
         # the id index maps 1:1 which the name index maps 1:many
-        for r in self.storage.read():
-            self.index[r.id] = r
-            self.name_index[r.name].add(r.id)
+        with metrics.timer("dictionary_index_build_seconds"):
+            for r in self.storage.read():
+                self.index[r.id] = r
+                self.name_index[r.name].add(r.id)
+                self._index_fields(r, None)
 
-        self._name_cache: tuple[str, ...] = tuple(self.name_index.keys())
+            if not lazy:
+                self._refresh_name_cache()
+        metrics.gauge("dictionary_records", len(self.index))
 
         self.new_record_count: int = 0
         self.updated_record_count: int = 0
+        self.removed_record_count: int = 0
+
+        # ids added, updated or removed since the last save, used for incremental saves
+        self._changed: set[int] = set()
+        self._removed: set[int] = set()
+
+        # ids and names changed since the last published view
+        self._view: DictionaryView | None = DictionaryView.build(self.index, self.name_index) if versioned else None
+        self._touched_ids: set[int] = set()
+        self._touched_names: set[str] = set()
+
+    def snapshot(self) -> DictionaryView:
+        """
+        Returns the latest published version of the dictionary. Safe to read from any thread
+        without locking, it never changes once returned.
+        """
+        if self._view is None:
+            raise Exception("snapshot() requires a dictionary created with versioned=True")
+        return self._view
+
+    def _touch(self, id: int, *names: str) -> None:
+        if self.versioned:
+            self._touched_ids.add(id)
+            self._touched_names.update(names)
+
+    def _publish(self) -> None:
+        if self._view is None or not self._touched_ids:
+            return
+
+        # built completely before a single assignment swaps it in, readers see the old or the new version
+        self._view = self._view.evolve(self.index, self.name_index, self._touched_ids, self._touched_names)
+        self._touched_ids = set()
+        self._touched_names = set()
 
     def records(self) -> list[Record]:
         """
@@ -34,6 +163,7 @@ class Dictionary:
         """
         return list(self.index.values())
 
+    @metrics.timed("dictionary_lookup_seconds")
     def lookup(self, lookup_value: str) -> list[Record]:
         """
         Performs a direct lookup based on the 'name' field
@@ -46,6 +176,53 @@ class Dictionary:
 
         return [self.index[id] for id in ids] if ids else []
 
+    def query(self, **filters: Any) -> list[Record]:
+        """
+        Returns the records matching every filter, in id order. Filters can be any of 'name' or the
+        indexed fields (table_name, page_status, phi, pii). A filter value may be a single value,
+        a list/set/tuple of accepted values, or wrapped in Not(...) to exclude values.
+
+        ex: query(phi="Yes", table_name=["encounter", "facility"], page_status=Not("Approved"))
+
+        Note
+        ----
+        Filters are answered from the secondary indexes by intersecting id sets, records are never scanned.
+        """
+        include: list[set[int]] = []
+        exclude: list[set[int]] = []
+
+        for field, value in filters.items():
+            if field == "name":
+                index = self.name_index
+            elif field in self.field_index:
+                index = self.field_index[field]
+            else:
+                raise Exception(f"cannot query on field '{field}', expected one of name, {', '.join(INDEXED_FIELDS)}")
+
+            negate = isinstance(value, Not)
+            if negate:
+                value = value.value
+            values = value if isinstance(value, (list, set, frozenset, tuple)) else (value,)
+
+            ids: set[int] = set()
+            for v in values:
+                ids |= index.get(v, set())
+            (exclude if negate else include).append(ids)
+
+        # start from the smallest set so every intersection stays small
+        if include:
+            include.sort(key=len)
+            result = set(include[0])
+            for ids in include[1:]:
+                result &= ids
+        else:
+            result = set(self.index.keys())
+
+        for ids in exclude:
+            result -= ids
+
+        return [self.index[id] for id in sorted(result)]
+
     def unique(self, records: list[Record]) -> list[Record]:
         """
         Filter a list of records so that only records with unique descriptions remain.
@@ -60,6 +237,19 @@ class Dictionary:
 
         return unique
 
+    def alignment_candidates(self, threshold: float = 0.7) -> list[AlignmentGroup]:
+        """
+        Dictionary wide counterpart to unique(). Finds records sharing a (similar) name whose descriptions
+        are near duplicates of each other, ranked by how many records they would align.
+
+        Note
+        ----
+        threshold is the estimated Jaccard similarity between descriptions required to group them.
+        Each group's patch() returns copies aligned to its most common description (see Record.patch_batch).
+        """
+        return alignment_candidates(self.index.values(), threshold)
+
+    @metrics.timed("dictionary_fuzzy_lookup_seconds")
     def fuzzy_lookup(self, lookup_value: str, threshold: int) -> list[Record]:
         """
         Performs a fuzzy lookup based on the 'name' field. Only records with a 'name' value whose similarity score exceeds the threshold are returned.
@@ -68,7 +258,12 @@ class Dictionary:
         ----
         This method may return multiple records all of which share the same 'name' value.
         """
-        search_result = process.extractOne(lookup_value, self._name_cache, scorer=fuzz.WRatio)
+        # only score the names sharing the most trigrams with the lookup value
+        choices = self._name_grams().candidates(lookup_value, MAX_FUZZY_CANDIDATES)
+        if len(choices) < MIN_FUZZY_CANDIDATES:
+            choices = self._names()
+
+        search_result = process.extractOne(lookup_value, choices, scorer=fuzz.WRatio)
 
         if search_result is None:
             return []
@@ -76,60 +271,334 @@ class Dictionary:
             best_match, score, _ = search_result
             return self.lookup(best_match) if score >= threshold else []
 
+    def warm_up(self) -> None:
+        """
+        Builds the structures fuzzy_lookup otherwise builds on first use, ex: before sharing the
+        dictionary between threads that only read from it
+        """
+        self._names()
+        self._name_grams()
+
+    def _names(self) -> tuple[str, ...]:
+        if self._name_cache is None:
+            self._name_cache = tuple(self.name_index.keys())
+        return self._name_cache
+
+    def search(self, text: str, limit: int = 10) -> list[SearchHit]:
+        """
+        Full text search over the 'title' and 'description' fields, ranked by BM25.
+
+        Note
+        ----
+        Plain terms, prefix terms (admit*) and quoted phrases ("admit date") can be combined, ex:
+        search('patient "admit date" disch*'). Records matching any of them are returned, best first.
+        """
+        return [SearchHit(self.index[id], score) for id, score in self._text_index().search(text, limit)]
+
+    def _text_index(self) -> TextIndex:
+        # loaded from storage when a current one was saved, otherwise built on first use.
+        # either way add() keeps it up to date afterwards
+        if self._text is None and self.storage.snapshot:
+            self._text = self.storage.read_text_index()
+
+            # the saved index matches storage as it was loaded, catch it up with the
+            # changes made since (add() only updates an index that already exists)
+            if self._text is not None:
+                for id in self._removed:
+                    self._text.remove(id)
+                for id in self._changed:
+                    record = self.index[id]
+                    self._text.add(record.id, record.title, record.description)
+
+        if self._text is None:
+            self._text = TextIndex()
+            for record in self.index.values():
+                self._text.add(record.id, record.title, record.description)
+
+        return self._text
+
+    def _name_grams(self) -> TrigramIndex:
+        # built on first use, then kept up to date by add()
+        if self._grams is None:
+            self._grams = TrigramIndex(self.name_index.keys())
+        return self._grams
+
+    def _processed_names(self) -> tuple[str, ...]:
+        # lowercased/normalized copy of the name cache, built once per cache rather than per query
+        if self._processed_name_cache is None:
+            self._processed_name_cache = tuple(utils.default_process(name) for name in self._names())
+        return self._processed_name_cache
+
+    def fuzzy_lookup_many(self, lookup_values: list[str], threshold: int, limit: int = 5) -> list[list[FuzzyMatch]]:
+        """
+        Performs a fuzzy lookup for a batch of names at once, returning up to 'limit' matches per lookup value
+        (best first) whose score meets the threshold. Results are in the same order as lookup_values.
+
+        Note
+        ----
+        Names are compared after lowercasing and stripping non alphanumeric characters. When numpy is
+        installed the whole batch is scored as one matrix across all cores.
+        """
+        names = self._names()
+        choices = self._processed_names()
+        queries = [utils.default_process(value) for value in lookup_values]
+
+        def match(scores: list[tuple[int, float]]) -> list[FuzzyMatch]:
+            return [FuzzyMatch(names[i], score, self.lookup(names[i])) for i, score in scores]
+
+        if np is None or not choices:
+            return [
+                match([(i, score) for _, score, i in process.extract(
+                    query, choices, scorer=fuzz.WRatio, limit=limit, score_cutoff=threshold
+                )])
+                for query in queries
+            ]
+
+        results: list[list[FuzzyMatch]] = []
+        k = min(limit, len(choices))
+        rows_per_chunk = max(1, MAX_SCORE_MATRIX_BYTES // (4 * len(choices)))
+
+        for start in range(0, len(queries), rows_per_chunk):
+            matrix = process.cdist(
+                queries[start:start + rows_per_chunk], choices,
+                scorer=fuzz.WRatio, score_cutoff=threshold, dtype=np.float32, workers=-1
+            )
+            top = np.argpartition(-matrix, k - 1, axis=1)[:, :k]
+
+            for row, columns in zip(matrix, top):
+                ranked = sorted(((int(i), float(row[i])) for i in columns), key=lambda m: (-m[1], m[0]))
+                results.append(match([(i, score) for i, score in ranked if score >= threshold]))
+
+        return results
+
     def _refresh_name_cache(self) -> None:
-        self._name_cache = tuple(self.name_index.keys())
+        # lazy dictionaries only drop the cache, it is rebuilt on the next fuzzy lookup.
+        # batches do the same and rebuild it once when they close
+        self._processed_name_cache = None
+        self._name_cache = None if self.lazy or self._batch_depth else tuple(self.name_index.keys())
 
-    def add(self, record: Record) -> None:
+    @contextmanager
+    def batch(self) -> Iterator[AddSummary]:
+        """
+        Groups many add() calls so derived structures are only rebuilt once, when the batch closes.
+        Yields a summary of the records added inside the batch.
+
+        Usage
+        -----
+        with dictionary.batch() as summary:
+            for record in records:
+                dictionary.add(record)
+        """
+        if self._batch_summary is None:
+            self._batch_summary = AddSummary()
+        summary = self._batch_summary
+        self._batch_depth += 1
+
+        try:
+            yield summary
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._batch_summary = None
+                self._refresh_name_cache()
+                self._publish()
+
+    def add_many(self, records: Iterable[Record]) -> AddSummary:
+        """
+        Adds or updates many records at once. Index mutations are applied as records arrive
+        and the name cache is rebuilt once at the end rather than after every new name.
+        """
+        with self.batch() as summary:
+            for record in records:
+                self.add(record)
+
+        return summary
+
+    def _index_name(self, name: str, id: int) -> bool:
+        """
+        Adds an id to the name index. Returns True if the name is new.
+        """
+        ids = self.name_index.get(name)
+        if ids is not None:
+            ids.add(id)
+            return False
+
+        self.name_index[name] = {id}
+        if self._grams is not None:
+            self._grams.add(name)
+        return True
+
+    def _unindex_name(self, name: str, id: int) -> bool:
+        """
+        Removes an id from the name index. Returns True if the name is gone.
+        """
+        ids = self.name_index[name]
+        ids.discard(id)
+
+        if ids:
+            return False
+
+        del self.name_index[name]
+        if self._grams is not None:
+            self._grams.remove(name)
+        return True
+
+    def _index_fields(self, record: Record, existing: Record | None) -> None:
+        for field, index in self.field_index.items():
+            value = getattr(record, field)
+            if existing is not None:
+                previous = getattr(existing, field)
+                if previous == value:
+                    continue
+                self._unindex_field(field, previous, record.id)
+            index[value].add(record.id)
+
+    def _unindex_field(self, field: str, value: str | None, id: int) -> None:
+        index = self.field_index[field]
+        ids = index[value]
+        ids.discard(id)
+        if not ids:
+            del index[value]
+
+    def add(self, record: Record) -> AddOutcome:
         """
         Adds or updates records in the dictionary. Existing records are skipped.
+        Returns whether the record was new, updated or unchanged.
         """
+        outcome = self._add(record)
+        metrics.inc("dictionary_adds_total", outcome=outcome)
+
+        if self._batch_summary is not None:
+            self._batch_summary.count(outcome)
+        elif outcome != "unchanged":
+            self._publish()
+
+        return outcome
+
+    def remove(self, id: int) -> Record | None:
+        """
+        Removes a record (ex: a column deleted in Alation) from the dictionary and all of its indexes.
+        Returns the removed record, if there was one.
+        """
+        existing = self.index.get(id)
+        if existing is None:
+            return None
+
+        del self.index[id]
+        # the name cache only changes when this was the name's last record
+        if self._unindex_name(existing.name, id):
+            self._refresh_name_cache()
+        for field in INDEXED_FIELDS:
+            self._unindex_field(field, getattr(existing, field), id)
+        if self._text is not None:
+            self._text.remove(id)
+
+        self.removed_record_count += 1
+        self._changed.discard(id)
+        self._removed.add(id)
+        if self.storage.journal:
+            self.storage.append_removal(id)
+
+        self._touch(id, existing.name)
+        if not self._batch_depth:
+            self._publish()
+        return existing
+
+    def _add(self, record: Record) -> AddOutcome:
         existing = self.index.get(record.id)
 
         # skip existing records
         if existing == record:
-            return
+            return "unchanged"
+
+        if self.versioned:
+            self._touch(record.id, record.name, *([existing.name] if existing is not None else []))
 
         # add new records
         if existing is None:
             self.index[record.id] = record
-            before = len(self.name_index)
-            self.name_index[record.name].add(record.id)
+            self._index_fields(record, None)
 
-            if len(self.name_index) != before:
+            if self._index_name(record.name, record.id):
                 self._refresh_name_cache()
 
             self.new_record_count += 1
-            return
+            self._changed.add(record.id)
+            self._removed.discard(record.id)
+            if self._text is not None:
+                self._text.add(record.id, record.title, record.description)
+            if self.storage.journal:
+                self.storage.append(record)
+            return "new"
 
         # patch name index if our record is stale
         if existing.name != record.name:
-            self.name_index[existing.name].discard(record.id)
-            self.name_index[record.name].add(record.id)
-
-            if not self.name_index[existing.name]:
-                del self.name_index[existing.name]
-
-            self._refresh_name_cache()
+            dropped = self._unindex_name(existing.name, record.id)
+            if self._index_name(record.name, record.id) or dropped:
+                self._refresh_name_cache()
         else:
             self.name_index[record.name].add(record.id)
 
-        # patch index if our record is stale
+        # patch indexes if our record is stale
+        self._index_fields(record, existing)
         self.index[record.id] = record
         self.updated_record_count += 1
+        self._changed.add(record.id)
+        if self._text is not None:
+            self._text.add(record.id, record.title, record.description)
+        if self.storage.journal:
+            self.storage.append(record)
+        return "updated"
+
+    def share(self, name: str | None = None) -> SharedSnapshot:
+        """
+        Copies the dictionary into shared memory that worker processes can attach to without
+        copying, see SharedSnapshot. Close the returned snapshot to free the segment.
+        """
+        return SharedSnapshot.create(self.index.values(), name)
 
-    def export_records(self, records: list[Record], path: str) -> None:
+    def export_records(self, records: Iterable[Record], path: str) -> None:
         """
-        Exports a list of records as csv to the specified path
+        Exports records as csv to the specified path, see export.export for other formats
         """
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(Record.model_fields.keys())
-            for r in records:
-                writer.writerow(r.model_dump().values())
+        export(records, path, format=ExportFormat.CSV)
+
+    def export(self, path: str, **options: Any) -> int:
+        """
+        Streams every record in the dictionary to path, options are passed to export.export
+        """
+        return export(self.index.values(), path, **options)
 
     def has_updates(self) -> bool:
-        return self.new_record_count > 0 or self.updated_record_count > 0
+        return self.new_record_count > 0 or self.updated_record_count > 0 or self.removed_record_count > 0
 
     def save(self) -> None:
-        if self.has_updates():
-            self.storage.write(self.records())
+        """
+        Persists the dictionary. Storage that supports upserts only receives the records
+        added or updated since the last save, everything else is rewritten in full. Journaled
+        storage already holds every change (add() appends them) so saving only syncs the journal.
+
+        Note
+        ----
+        With storage.snapshot set the binary snapshot and search index are rewritten in full on
+        every save, on top of the incremental write.
+        """
+        if not self.has_updates():
+            return
+
+        with metrics.timer("dictionary_save_seconds"):
+            match self.storage.type:
+                case StorageType.DB:
+                    self.storage.upsert(self.index[id] for id in self._changed)
+                    self.storage.delete(self._removed)
+                case StorageType.LOCAL_FILE if self.storage.journal:
+                    self.storage.sync()
+                case _:
+                    self.storage.write(self.records())
+
+            if self.storage.snapshot:
+                self.storage.write_snapshot(self.index.values())
+                self.storage.write_text_index(self._text_index())
+
+        self._changed.clear()
+        self._removed.clear()
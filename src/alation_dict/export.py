@@ -0,0 +1,182 @@
+import bz2
+import csv
+import gzip
+import json
+import lzma
+import os
+from collections.abc import Callable, Iterable, Iterator
+from enum import Enum
+from itertools import islice
+from typing import IO, Any
+
+from .record import Record
+
+try:
+    import pyarrow as pa  # pyright: ignore[reportMissingImports]
+    import pyarrow.ipc as ipc  # pyright: ignore[reportMissingImports]
+    import pyarrow.parquet as pq  # pyright: ignore[reportMissingImports]
+except ImportError:  # optional, enables parquet and arrow exports
+    pa = ipc = pq = None
+
+class ExportFormat(Enum):
+    """
+    Supported export formats. The value is the file suffix used to infer the format from a path.
+    """
+    CSV = ".csv"
+    NDJSON = ".ndjson"
+    PARQUET = ".parquet"
+    ARROW = ".arrow"
+
+FIELDS: tuple[str, ...] = tuple(Record.model_fields.keys())
+DEFAULT_BATCH_SIZE: int = 10_000
+
+# whole-file compression for the text formats, parquet and arrow compress internally
+TEXT_COMPRESSION: dict[str, Callable[..., IO[Any]]] = {
+    "gzip": gzip.open,
+    "bz2": bz2.open,
+    "xz": lzma.open,
+}
+COMPRESSION_SUFFIXES: dict[str, str] = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+def _infer(path: str, format: ExportFormat | None, compression: str | None) -> tuple[ExportFormat, str | None]:
+    root, suffix = os.path.splitext(path)
+    if suffix in COMPRESSION_SUFFIXES:
+        compression = compression or COMPRESSION_SUFFIXES[suffix]
+        suffix = os.path.splitext(root)[1]
+
+    if format is None:
+        if suffix == ".jsonl":
+            return ExportFormat.NDJSON, compression
+        try:
+            format = ExportFormat(suffix)
+        except ValueError:
+            raise Exception(f"cannot infer export format from path {path}, pass format explicitly")
+
+    return format, compression
+
+def _batches(records: Iterable[Record], size: int) -> Iterator[list[Record]]:
+    records = iter(records)
+    while batch := list(islice(records, size)):
+        yield batch
+
+def export(
+    records: Iterable[Record],
+    path: str,
+    format: ExportFormat | None = None,
+    columns: Iterable[str] | None = None,
+    compression: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """
+    Streams records to path and returns the number of rows written. Records can come from any
+    iterable (a Dictionary, a Storage read or Client.get directly) and are consumed batch_size at
+    a time, so memory use does not grow with the number of rows exported.
+
+    Note
+    ----
+    The format is inferred from the path (.csv, .ndjson/.jsonl, .parquet, .arrow) unless given.
+    CSV and NDJSON accept gzip, bz2 or xz compression, which is also inferred from a trailing .gz,
+    .bz2 or .xz. Parquet and arrow accept any codec pyarrow supports for them (ex: zstd, snappy)
+    and require the 'arrow' extra.
+
+    The file is written next to path and renamed over it, so a failed export never leaves a partial file.
+
+    Usage
+    -----
+    export(client.get(Endpoint.COLUMN), "columns.parquet", columns=["id", "name", "description"], compression="zstd")
+    """
+    format, compression = _infer(path, format, compression)
+    columns = _columns(columns)
+    tmp = f"{path}.tmp"
+
+    try:
+        match format:
+            case ExportFormat.CSV | ExportFormat.NDJSON:
+                if compression is not None and compression not in TEXT_COMPRESSION:
+                    raise Exception(f"unsupported compression for {format.name}: {compression}")
+
+                opener = TEXT_COMPRESSION[compression] if compression else open
+                with opener(tmp, "wt", newline="", encoding="utf-8") as f:
+                    rows = write_text(records, f, format, columns, batch_size)
+            case ExportFormat.PARQUET | ExportFormat.ARROW:
+                rows = _write_arrow(tmp, _batches(records, batch_size), columns, format, compression)
+
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    return rows
+
+def _columns(columns: Iterable[str] | None) -> tuple[str, ...]:
+    columns = tuple(columns or FIELDS)
+    unknown = [c for c in columns if c not in Record.model_fields]
+    if unknown:
+        raise Exception(f"unknown export columns: {', '.join(unknown)}")
+    return columns
+
+def write_text(
+    records: Iterable[Record],
+    f: IO[str],
+    format: ExportFormat,
+    columns: Iterable[str] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """
+    Streams records as csv or ndjson to an open text stream (ex: a socket or stdout), returns the number of rows written
+    """
+    columns = _columns(columns)
+    batches = _batches(records, batch_size)
+
+    match format:
+        case ExportFormat.CSV:
+            return _write_csv(f, batches, columns)
+        case ExportFormat.NDJSON:
+            return _write_ndjson(f, batches, columns)
+        case _:
+            raise Exception(f"{format.name} can only be exported to a file")
+
+def _write_csv(f: IO[str], batches: Iterator[list[Record]], columns: tuple[str, ...]) -> int:
+    writer = csv.writer(f)
+    writer.writerow(columns)
+
+    rows = 0
+    for batch in batches:
+        writer.writerows([getattr(r, c) for c in columns] for r in batch)
+        rows += len(batch)
+    return rows
+
+def _write_ndjson(f: IO[str], batches: Iterator[list[Record]], columns: tuple[str, ...]) -> int:
+    rows = 0
+    for batch in batches:
+        f.write("".join(
+            json.dumps({c: getattr(r, c) for c in columns}, ensure_ascii=False) + "\n" for r in batch
+        ))
+        rows += len(batch)
+    return rows
+
+def _write_arrow(
+    path: str,
+    batches: Iterator[list[Record]],
+    columns: tuple[str, ...],
+    format: ExportFormat,
+    compression: str | None
+) -> int:
+    if pa is None or pq is None or ipc is None:
+        raise Exception(f"{format.name} export requires pyarrow, install alation-dict[arrow]")
+
+    schema = pa.schema([(c, pa.int64() if c == "id" else pa.string()) for c in columns])
+
+    if format is ExportFormat.PARQUET:
+        writer = pq.ParquetWriter(path, schema, compression=compression or "snappy")
+    else:
+        options = ipc.IpcWriteOptions(compression=compression) if compression else None
+        writer = ipc.new_file(path, schema, options=options)
+
+    rows = 0
+    with writer:
+        for batch in batches:
+            arrays = [pa.array([getattr(r, c) for r in batch], type=schema.field(c).type) for c in columns]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            rows += len(batch)
+    return rows
@@ -0,0 +1,75 @@
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+def iter_array(chunks: Iterable[str]) -> Iterator[Any]:
+    """
+    Incrementally decodes a top level JSON array, yielding one element at a time as soon as
+    it has been fully received. Only the current element (plus whatever is left of the
+    last chunk) is held in memory, so memory use does not grow with the size of the array.
+
+    Note
+    ----
+    Chunks must already be decoded text, ex: response.iter_content(decode_unicode=True)
+    """
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    exhausted = False
+    started = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, exhausted
+        for chunk in chunks:
+            if chunk:
+                # drop what has already been consumed so the buffer stays small
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                return True
+        exhausted = True
+        return False
+
+    def skip(chars: str) -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return
+
+    skip(_WHITESPACE)
+    if pos >= len(buffer) or buffer[pos] != "[":
+        raise ValueError("expected a JSON array")
+    pos += 1
+
+    while True:
+        skip(_WHITESPACE + ("," if started else ""))
+
+        if pos >= len(buffer):
+            raise ValueError("unexpected end of JSON array")
+
+        if buffer[pos] == "]":
+            return
+
+        while True:
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if fill():
+                    continue
+                raise
+
+            # a number may be split across chunks (ex: "-1" + ".5") so only accept a
+            # value once the character that follows it is known to end it
+            if (end == len(buffer) or buffer[end] not in _DELIMITERS) and not exhausted and fill():
+                continue
+
+            break
+
+        pos = end
+        started = True
+        yield value
@@ -0,0 +1,238 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+from dataclasses import dataclass, field
+from typing import ParamSpec, Protocol, TypeVar
+
+# every metric name is prefixed so exported metrics don't collide with anything else being scraped
+PREFIX = "alation_dict_"
+
+# upper bounds (seconds) of the histogram buckets, the prometheus client defaults plus
+# a few sub-millisecond buckets for in-memory lookups
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.00001, 0.0001, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+Labels = tuple[tuple[str, str], ...]
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+class Sink(Protocol):
+    """
+    Receives measurements from Client, Record, Storage and Dictionary. Implement this to forward
+    metrics somewhere else (statsd, logs...), then install it with set_sink.
+    """
+
+    def counter(self, name: str, value: float, labels: Labels) -> None: ...
+
+    def gauge(self, name: str, value: float, labels: Labels) -> None: ...
+
+    def histogram(self, name: str, value: float, labels: Labels) -> None: ...
+
+# instrumentation is opt-in, nothing is measured until a sink is installed
+_sink: Sink | None = None
+
+def set_sink(sink: Sink | None) -> None:
+    """
+    Installs the sink every instrumented call reports to, None turns instrumentation off
+    """
+    global _sink
+    _sink = sink
+
+def enabled() -> bool:
+    return _sink is not None
+
+def _labels(labels: dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def inc(name: str, value: float = 1, **labels: object) -> None:
+    if _sink is not None:
+        _sink.counter(PREFIX + name, value, _labels(labels))
+
+def gauge(name: str, value: float, **labels: object) -> None:
+    if _sink is not None:
+        _sink.gauge(PREFIX + name, value, _labels(labels))
+
+def observe(name: str, value: float, **labels: object) -> None:
+    if _sink is not None:
+        _sink.histogram(PREFIX + name, value, _labels(labels))
+
+@contextmanager
+def timer(name: str, **labels: object) -> Iterator[None]:
+    """
+    Observes how long the block took, in seconds
+    """
+    if _sink is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+def timed(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Decorator observing how long each call took. Cheaper than timer() when instrumentation is
+    off, which matters for calls as fast as a direct lookup.
+    """
+    def decorator(fn: Callable[P, R]) -> Callable[P, R]:
+        @wraps(fn)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if _sink is None:
+                return fn(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def validated(count: int, seconds: float) -> None:
+    """
+    Reports a batch of validated records, along with the rate it was validated at
+    """
+    inc("records_validated_total", count)
+    observe("record_validation_seconds", seconds)
+    if seconds > 0:
+        gauge("record_validation_records_per_second", count / seconds)
+
+@dataclass
+class Histogram:
+    buckets: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)
+    sum: float = 0.0
+    count: int = 0
+
+    def __post_init__(self):
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        # the last slot counts observations above the largest bucket (+Inf)
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+class InMemoryCollector:
+    """
+    Sink keeping every metric in memory, keyed by (name, labels). Safe to share between threads.
+
+    Usage
+    -----
+    collector = InMemoryCollector()
+    metrics.set_sink(collector)
+    ...
+    collector.counters[("alation_dict_client_pages_total", ())]
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets: tuple[float, ...] = buckets
+        self.counters: dict[tuple[str, Labels], float] = {}
+        self.gauges: dict[tuple[str, Labels], float] = {}
+        self.histograms: dict[tuple[str, Labels], Histogram] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def counter(self, name: str, value: float, labels: Labels) -> None:
+        with self._lock:
+            key = (name, labels)
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def gauge(self, name: str, value: float, labels: Labels) -> None:
+        with self._lock:
+            self.gauges[(name, labels)] = value
+
+    def histogram(self, name: str, value: float, labels: Labels) -> None:
+        with self._lock:
+            key = (name, labels)
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def get(self, name: str, **labels: object) -> float | Histogram | None:
+        """
+        Returns the counter, gauge or histogram with the given name (with or without the prefix) and labels
+        """
+        key = (name if name.startswith(PREFIX) else PREFIX + name, _labels(labels))
+        with self._lock:
+            for metrics in (self.counters, self.gauges, self.histograms):
+                if key in metrics:
+                    return metrics[key]
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+def _format_value(value: float) -> str:
+    # counters such as bytes get large, so whole numbers are written out in full
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+def _format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = labels + (extra,) if extra else labels
+    if not pairs:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')) for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+class PrometheusExporter:
+    """
+    Renders an InMemoryCollector in the prometheus text exposition format, either to serve from
+    a /metrics endpoint or to write for node_exporter's textfile collector.
+    """
+
+    def __init__(self, collector: InMemoryCollector):
+        self.collector: InMemoryCollector = collector
+
+    def render(self) -> str:
+        collector = self.collector
+        lines: list[str] = []
+
+        with collector._lock:
+            for kind, metrics in (("counter", collector.counters), ("gauge", collector.gauges)):
+                for name in sorted({name for name, _ in metrics}):
+                    lines.append(f"# TYPE {name} {kind}")
+                    for (n, labels), value in sorted(metrics.items()):
+                        if n == name:
+                            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+            for name in sorted({name for name, _ in collector.histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (n, labels), histogram in sorted(collector.histograms.items(), key=lambda h: h[0]):
+                    if n != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip((*histogram.buckets, float("inf")), histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """
+        Writes the rendered metrics to path, atomically so a scraper never reads a partial file
+        """
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
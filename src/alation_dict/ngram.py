@@ -0,0 +1,62 @@
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+
+# candidates() only probes postings longer than this many times its limit, see TrigramIndex.candidates
+LONG_POSTING_FACTOR = 16
+
+def trigrams(value: str) -> set[str]:
+    """
+    Character trigrams of a lowercased value, padded so short values and word boundaries still produce grams
+    """
+    padded = f"  {value.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class TrigramIndex:
+    """
+    Character trigram inverted index over names. Used to narrow a fuzzy lookup down to the names that share
+    the most trigrams with the query before running the (comparatively expensive) scorer over them.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.postings: defaultdict[str, set[str]] = defaultdict(set)
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        for gram in trigrams(name):
+            self.postings[gram].add(name)
+
+    def remove(self, name: str) -> None:
+        for gram in trigrams(name):
+            names = self.postings.get(gram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self.postings[gram]
+
+    def candidates(self, query: str, limit: int) -> list[str]:
+        """
+        Returns up to 'limit' names sharing the most trigrams with the query, most shared first
+
+        Note
+        ----
+        Grams are counted rarest first. Once 'limit' names are in hand, postings longer than
+        LONG_POSTING_FACTOR * limit (common grams like 'ate' or '_id') are not walked, only probed for
+        the names already counted. A name sharing nothing but common grams with the query can't make
+        the cut anyway, and walking those postings is what made large vocabularies slow.
+        """
+        postings = sorted(
+            (names for gram in trigrams(query) if (names := self.postings.get(gram))),
+            key=len
+        )
+        long_posting = LONG_POSTING_FACTOR * limit
+
+        counts: Counter[str] = Counter()
+        for names in postings:
+            if len(names) <= long_posting or len(counts) < limit:
+                counts.update(names)
+            else:
+                # probe from the smaller side, counts is usually far smaller than the posting
+                counts.update(counts.keys() & names)
+
+        return [name for name, _ in counts.most_common(limit)]
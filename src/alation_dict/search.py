@@ -0,0 +1,174 @@
+import json
+import math
+import os
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any
+
+TOKEN = re.compile(r"[a-z0-9]+")
+# quoted phrases, or single terms with an optional trailing * for prefix matching
+CLAUSE = re.compile(r'"([^"]*)"|(\S+)')
+
+# title and description are indexed as one document. the gap keeps a phrase from
+# matching across the end of the title and the start of the description
+FIELD_GAP = 100
+
+# standard BM25 parameters
+K1 = 1.2
+B = 0.75
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN.findall(text.lower())
+
+class TextIndex:
+    """
+    Positional inverted index over record titles and (already cleaned) descriptions.
+
+    Supports BM25 ranked queries made of plain terms, prefix terms (admit*) and quoted phrases
+    ("admit date"). Every clause contributes to the score and a record must match at least one.
+    """
+
+    def __init__(self):
+        # term -> id -> positions of the term in that record
+        self.postings: dict[str, dict[int, list[int]]] = defaultdict(dict)
+        self.lengths: dict[int, int] = {}
+        # distinct terms per record, so a record can be removed without walking every posting
+        self.terms: dict[int, tuple[str, ...]] = {}
+        self.total_length: int = 0
+        self._vocabulary: list[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def add(self, id: int, title: str, description: str) -> None:
+        """
+        Indexes a record, replacing whatever was previously indexed for the same id
+        """
+        if id in self.lengths:
+            self.remove(id)
+
+        title_tokens = tokenize(title)
+        description_tokens = tokenize(description)
+        offset = len(title_tokens) + FIELD_GAP
+
+        positions: defaultdict[str, list[int]] = defaultdict(list)
+        for position, token in enumerate(title_tokens):
+            positions[token].append(position)
+        for position, token in enumerate(description_tokens):
+            positions[token].append(offset + position)
+
+        for token, found in positions.items():
+            if token not in self.postings:
+                self._vocabulary = None
+            self.postings[token][id] = found
+
+        length = len(title_tokens) + len(description_tokens)
+        self.lengths[id] = length
+        self.terms[id] = tuple(positions)
+        self.total_length += length
+
+    def remove(self, id: int) -> None:
+        length = self.lengths.pop(id, None)
+        if length is None:
+            return
+
+        self.total_length -= length
+        for token in self.terms.pop(id):
+            del self.postings[token][id]
+            if not self.postings[token]:
+                del self.postings[token]
+                self._vocabulary = None
+
+    def _expand(self, prefix: str) -> list[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+
+        i = bisect_left(self._vocabulary, prefix)
+        terms: list[str] = []
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(prefix):
+            terms.append(self._vocabulary[i])
+            i += 1
+        return terms
+
+    def _score_term(self, term: str, scores: dict[int, float], only: set[int] | None = None) -> None:
+        matches = self.postings.get(term)
+        if not matches:
+            return
+
+        n = len(self.lengths)
+        average = self.total_length / n if n else 0
+        idf = math.log(1 + (n - len(matches) + 0.5) / (len(matches) + 0.5))
+
+        for id, positions in matches.items():
+            if only is not None and id not in only:
+                continue
+            tf = len(positions)
+            norm = 1 - B + B * self.lengths[id] / average if average else 1
+            scores[id] = scores.get(id, 0.0) + idf * tf * (K1 + 1) / (tf + K1 * norm)
+
+    def _phrase(self, terms: list[str]) -> set[int]:
+        postings = [self.postings.get(term) for term in terms]
+        if not all(postings):
+            return set()
+
+        ids = set.intersection(*(set(p) for p in postings))  # type: ignore[union-attr]
+        found: set[int] = set()
+        for id in ids:
+            starts = set(postings[0][id])  # type: ignore[index]
+            for offset, matches in enumerate(postings[1:], start=1):
+                starts &= {p - offset for p in matches[id]}  # type: ignore[index]
+                if not starts:
+                    break
+            if starts:
+                found.add(id)
+        return found
+
+    def search(self, text: str, limit: int = 10) -> list[tuple[int, float]]:
+        """
+        Returns up to 'limit' (id, score) pairs, best first
+        """
+        scores: dict[int, float] = {}
+
+        for phrase, term in CLAUSE.findall(text):
+            if phrase:
+                terms = tokenize(phrase)
+                matched = self._phrase(terms) if terms else set()
+                for t in terms:
+                    self._score_term(t, scores, only=matched)
+            elif term.endswith("*"):
+                # only the last token is a prefix, ex: patient_adm* -> patient + adm*
+                *exact, prefix = tokenize(term) or [""]
+                for t in exact + (self._expand(prefix) if prefix else []):
+                    self._score_term(t, scores)
+            else:
+                for t in tokenize(term):
+                    self._score_term(t, scores)
+
+        return sorted(scores.items(), key=lambda s: (-s[1], s[0]))[:limit]
+
+    def save(self, path: str) -> None:
+        data: dict[str, Any] = {
+            "lengths": self.lengths,
+            "postings": self.postings,
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "TextIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        index = cls()
+        index.lengths = {int(id): length for id, length in data["lengths"].items()}
+        index.total_length = sum(index.lengths.values())
+        terms: defaultdict[int, list[str]] = defaultdict(list)
+        for term, matches in data["postings"].items():
+            index.postings[term] = {int(id): positions for id, positions in matches.items()}
+            for id in index.postings[term]:
+                terms[id].append(term)
+        index.terms = {id: tuple(t) for id, t in terms.items()}
+        return index
@@ -0,0 +1,352 @@
+import http.client
+import io
+import json
+import os
+import shutil
+import socket
+import socketserver
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from .dictionary import Dictionary
+from .export import ExportFormat, write_text
+from .record import Record
+from .storage import Storage
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+class LookupService:
+    """
+    Keeps one Dictionary loaded and serves it over local HTTP (or HTTP over a unix socket), so
+    scripts can look records up without paying for Storage.read() and the index build every time.
+
+    Endpoints
+    ---------
+    GET /lookup?name=...
+    GET /fuzzy_lookup?name=...&threshold=80
+    GET /export?format=csv|ndjson&columns=id,name    (streamed)
+    GET /health
+
+    Note
+    ----
+    Requests are served concurrently. The storage file (and its journal) are polled every
+    poll_interval seconds, when they change a new Dictionary is built in the background and swapped
+    in with a single assignment. Requests hold on to the dictionary they started with, so they are never
+    answered from a half built one. If a reload fails the previous dictionary keeps being served and
+    the error is reported by /health.
+
+    Usage
+    -----
+    with LookupService(Storage(StorageType.LOCAL_FILE, "dictionary.json")) as service:
+        service.serve_forever()
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        socket_path: str | None = None,
+        poll_interval: float = 1.0,
+        compact: bool = False
+    ):
+        self.storage: Storage = storage
+        self.socket_path: str | None = socket_path
+        self.poll_interval: float = poll_interval
+        self.compact: bool = compact
+        self.reloads: int = 0
+        self.loaded_at: str | None = None
+        self.reload_error: str | None = None
+        self._reload_lock: threading.Lock = threading.Lock()
+        self._stop: threading.Event = threading.Event()
+
+        self._signature: tuple[tuple[int, int] | None, ...] = self._stat()
+        self.dictionary: Dictionary = self._load()
+
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self._server: socketserver.BaseServer = _ThreadingUnixHTTPServer(socket_path, self._handler())
+        else:
+            self._server = ThreadingHTTPServer((host, port), self._handler())
+
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        if self.socket_path is not None:
+            return f"unix://{self.socket_path}"
+        host, port = self._server.server_address[:2]  # type: ignore[misc]
+        return f"http://{host}:{port}/"
+
+    def _stat(self) -> tuple[tuple[int, int] | None, ...]:
+        signature: list[tuple[int, int] | None] = []
+        for path in (self.storage.path, self.storage.journal_path):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _load(self) -> Dictionary:
+        # a fresh storage per load, sqlite connections can't move between threads
+        storage = Storage(
+            self.storage.type, self.storage.path,
+            journal=self.storage.journal,
+            compact_threshold=self.storage.compact_threshold,
+            snapshot=self.storage.snapshot
+        )
+        try:
+            dictionary = Dictionary(storage, compact=self.compact, lazy=True)
+            dictionary.warm_up()
+        finally:
+            storage.close()
+
+        self.loaded_at = datetime.now(timezone.utc).isoformat()
+        return dictionary
+
+    def reload(self) -> bool:
+        """
+        Rebuilds the dictionary if storage changed since it was loaded, returns whether it was swapped
+        """
+        with self._reload_lock:
+            signature = self._stat()
+            if signature == self._signature:
+                return False
+
+            try:
+                dictionary = self._load()
+            except Exception as e:
+                self.reload_error = f"{type(e).__name__}: {e}"
+                return False
+
+            self.dictionary = dictionary
+            self._signature = signature
+            self.reloads += 1
+            self.reload_error = None
+            return True
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self.reload()
+
+    def start(self) -> "LookupService":
+        """
+        Serves and watches storage on background threads
+        """
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, daemon=True),
+            threading.Thread(target=self._watch, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """
+        Serves until interrupted, watching storage on a background thread
+        """
+        watcher = threading.Thread(target=self._watch, daemon=True)
+        watcher.start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._stop.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._threads:
+            self._server.shutdown()
+        self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+        if self.socket_path is not None and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    def __enter__(self) -> "LookupService":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def health(self) -> dict[str, Any]:
+        return {
+            "records": len(self.dictionary.index),
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "reload_error": self.reload_error,
+        }
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def send_json(self, status: int, body: Any) -> None:
+                encoded = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                # one reference for the whole request, a reload may swap the dictionary meanwhile
+                dictionary = service.dictionary
+
+                try:
+                    match parsed.path:
+                        case "/lookup":
+                            records = dictionary.lookup(query["name"])
+                        case "/fuzzy_lookup":
+                            records = dictionary.fuzzy_lookup(query["name"], int(query.get("threshold", 80)))
+                        case "/export":
+                            self.export(dictionary, query)
+                            return
+                        case "/health":
+                            self.send_json(200, service.health())
+                            return
+                        case _:
+                            self.send_json(404, {"error": f"unknown path {parsed.path}"})
+                            return
+                except (KeyError, ValueError) as e:
+                    self.send_json(400, {"error": f"bad request: {e}"})
+                    return
+
+                self.send_json(200, [r.model_dump() for r in records])
+
+            def export(self, dictionary: Dictionary, query: dict[str, str]) -> None:
+                format = ExportFormat[query.get("format", "ndjson").upper()]
+                columns = query["columns"].split(",") if query.get("columns") else None
+
+                # checked up front, once the response has started errors can't be reported
+                if format not in (ExportFormat.CSV, ExportFormat.NDJSON):
+                    raise ValueError(f"{format.name} can't be streamed, use csv or ndjson")
+                unknown = [c for c in columns or () if c not in Record.model_fields]
+                if unknown:
+                    raise ValueError(f"unknown export columns: {', '.join(unknown)}")
+
+                # the body is streamed with no length, the end of the export is the end of the connection
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv" if format is ExportFormat.CSV else "application/x-ndjson")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+
+                f = io.TextIOWrapper(self.wfile, encoding="utf-8", newline="")  # type: ignore[arg-type]
+                try:
+                    write_text(dictionary.index.values(), f, format, columns)
+                    f.flush()
+                finally:
+                    f.detach()
+
+        return Handler
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path: str = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+class ServiceClient:
+    """
+    Thin client for a running LookupService. Keeps one keep-alive connection open, so it should
+    not be shared between threads.
+
+    Usage
+    -----
+    with ServiceClient() as client:                                  # http://127.0.0.1:8765/
+        records = client.lookup("admit_date")
+    with ServiceClient(socket_path="/tmp/alation-dict.sock") as client:
+        records = client.fuzzy_lookup("admit dt", threshold=80)
+    """
+
+    def __init__(self, url: str | None = None, socket_path: str | None = None, timeout: float = 30.0):
+        self.url: str = url or f"http://{DEFAULT_HOST}:{DEFAULT_PORT}/"
+        self.socket_path: str | None = socket_path
+        self.timeout: float = timeout
+        self._connection: http.client.HTTPConnection | None = None
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.socket_path is not None:
+            return _UnixHTTPConnection(self.socket_path, self.timeout)
+        parsed = urlparse(self.url)
+        return http.client.HTTPConnection(parsed.hostname or DEFAULT_HOST, parsed.port or DEFAULT_PORT, timeout=self.timeout)
+
+    def _request(self, path: str, params: dict[str, Any]) -> http.client.HTTPResponse:
+        if self._connection is None:
+            self._connection = self._connect()
+
+        target = f"{path}?{urlencode(params)}" if params else path
+        try:
+            self._connection.request("GET", target)
+            response = self._connection.getresponse()
+        except (ConnectionError, http.client.RemoteDisconnected):
+            # the service closed the kept-alive connection (ex: after an export), retry once on a new one
+            self._connection.close()
+            self._connection = self._connect()
+            self._connection.request("GET", target)
+            response = self._connection.getresponse()
+
+        if response.status != 200:
+            raise Exception(f"lookup service returned {response.status}: {response.read().decode('utf-8')}")
+        return response
+
+    def _records(self, path: str, params: dict[str, Any]) -> list[Record]:
+        body = json.loads(self._request(path, params).read())
+        return [Record.model_construct(**r) for r in body]
+
+    def lookup(self, lookup_value: str) -> list[Record]:
+        return self._records("/lookup", {"name": lookup_value})
+
+    def fuzzy_lookup(self, lookup_value: str, threshold: int) -> list[Record]:
+        return self._records("/fuzzy_lookup", {"name": lookup_value, "threshold": threshold})
+
+    def health(self) -> dict[str, Any]:
+        return json.loads(self._request("/health", {}).read())
+
+    def export(self, path: str, format: ExportFormat = ExportFormat.NDJSON, columns: list[str] | None = None) -> None:
+        """
+        Streams the service's dictionary to path as csv or ndjson
+        """
+        params: dict[str, Any] = {"format": format.name.lower()}
+        if columns:
+            params["columns"] = ",".join(columns)
+
+        response = self._request("/export", params)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            shutil.copyfileobj(response, f)
+        os.replace(tmp, path)
+
+        # the service closes the connection after an export
+        self.close()
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> "ServiceClient":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
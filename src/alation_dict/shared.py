@@ -0,0 +1,103 @@
+import os
+import sys
+import threading
+from collections.abc import Iterable
+from multiprocessing import resource_tracker, shared_memory
+
+from .record import Record
+from .snapshot import Snapshot, build_snapshot
+
+# serializes the resource_tracker.register swap in SharedSnapshot.attach
+_attach_lock = threading.Lock()
+
+def _buffer(shm: shared_memory.SharedMemory) -> memoryview:
+    # only None once the segment is closed
+    buf = shm.buf
+    if buf is None:
+        raise Exception(f"shared memory segment {shm.name} is closed")
+    return buf
+
+class SharedSnapshot(Snapshot):
+    """
+    Read-only dictionary held in shared memory, in the same format as the snapshot files written
+    by write_snapshot (packed records, id index, sorted name table and name postings).
+
+    One process creates it, any number of processes attach to it by name, or simply inherit it
+    across fork. Lookups decode rows straight from the shared buffer and no per record Python
+    objects are kept, so refcount updates never touch the shared pages and a host holds one copy
+    of the dataset however many workers it runs.
+
+    Note
+    ----
+    The fuzzy name table is decoded into each process on its first fuzzy_lookup, since the scorer
+    needs Python strings. That is one string per distinct name, not per record.
+
+    Only the creating process unlinks the segment, on close(). Attached (or forked) processes just detach.
+
+    Usage
+    -----
+    shared = SharedSnapshot.create(dictionary.records())      # in the parent, before forking workers
+    ...
+    with SharedSnapshot.attach(shared.name) as snapshot:       # in a worker
+        snapshot.lookup("admit_date")
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.name: str = shm.name
+        self.path: str = f"shm:{shm.name}"
+        self.owner: bool = owner
+        self._creator_pid: int = os.getpid()
+        self._shm: shared_memory.SharedMemory = shm
+        self._open(memoryview(_buffer(shm)))
+
+    @classmethod
+    def create(cls, records: Iterable[Record], name: str | None = None) -> "SharedSnapshot":
+        """
+        Packs records into a new shared memory segment
+        """
+        body, heap = build_snapshot(records)
+        size = len(body) + len(heap)
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+        buf = _buffer(shm)
+        buf[:len(body)] = body
+        buf[len(body):size] = heap
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedSnapshot":
+        """
+        Attaches to a segment created by SharedSnapshot.create in another process
+
+        Note
+        ----
+        Before Python 3.13 attaching registers the segment with the resource tracker, which would
+        unlink it from under the creator when this process exits. Unregistering afterwards isn't
+        enough, forked workers share the creator's tracker and would drop the creator's registration.
+        So resource_tracker.register is swapped for the duration of the attach. The swap holds a
+        module lock, so concurrent attaches can't restore each other's replacement, and the
+        replacement only skips this segment, so other threads registering resources meanwhile
+        (ex: creating a SharedMemory) are still tracked.
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+        else:
+            with _attach_lock:
+                register = resource_tracker.register
+
+                def skip_segment(resource: str, rtype: str) -> None:
+                    # posix segment names are registered with a leading slash
+                    if rtype != "shared_memory" or resource.lstrip("/") != name.lstrip("/"):
+                        register(resource, rtype)
+
+                resource_tracker.register = skip_segment  # type: ignore[assignment]
+                try:
+                    shm = shared_memory.SharedMemory(name=name)
+                finally:
+                    resource_tracker.register = register
+        return cls(shm, owner=False)
+
+    def _close_buffer(self) -> None:
+        self._shm.close()
+        if self.owner and os.getpid() == self._creator_pid:
+            self._shm.unlink()
@@ -0,0 +1,249 @@
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Sequence
+from typing import overload
+from rapidfuzz import fuzz, process
+
+from .record import Record
+
+MAGIC = b"ADSNAP01"
+
+# sections use native byte order so they can be cast straight to typed memoryviews
+# magic, record count, name count, then the offset of each section
+HEADER = struct.Struct("=8sIIQQQQQ")
+# id followed by (heap offset, length) for every string field
+STRING_FIELDS: tuple[str, ...] = tuple(f for f in Record.model_fields.keys() if f != "id")
+ROW = struct.Struct("=q" + "QI" * len(STRING_FIELDS))
+# heap offset, length, postings start, postings count
+NAME = struct.Struct("=QIII")
+
+# length used to encode None
+NULL = 0xFFFFFFFF
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+class _Heap:
+    """
+    Deduplicated utf-8 string heap. Repeated values (table names, boilerplate descriptions)
+    are stored once.
+    """
+
+    def __init__(self):
+        self.data: bytearray = bytearray()
+        self.refs: dict[str, tuple[int, int]] = {}
+
+    def add(self, value: str | None) -> tuple[int, int]:
+        if value is None:
+            return 0, NULL
+
+        ref = self.refs.get(value)
+        if ref is None:
+            encoded = value.encode("utf-8")
+            ref = (len(self.data), len(encoded))
+            self.data += encoded
+            self.refs[value] = ref
+        return ref
+
+def build_snapshot(records: Iterable[Record]) -> tuple[bytearray, bytearray]:
+    """
+    Packs records into the snapshot format, returns the fixed size sections and the string heap
+    which are written back to back.
+    """
+    rows = sorted(records, key=lambda r: r.id)
+    heap = _Heap()
+
+    postings: dict[str, list[int]] = {}
+    for row, record in enumerate(rows):
+        postings.setdefault(record.name, []).append(row)
+    names = sorted(postings)
+
+    rows_off = HEADER.size
+    ids_off = _align(rows_off + ROW.size * len(rows))
+    names_off = _align(ids_off + 8 * len(rows))
+    postings_off = _align(names_off + NAME.size * len(names))
+    heap_off = _align(postings_off + 4 * len(rows))
+
+    body = bytearray(heap_off)
+
+    for row, record in enumerate(rows):
+        refs: list[int] = []
+        for field in STRING_FIELDS:
+            refs.extend(heap.add(getattr(record, field)))
+        ROW.pack_into(body, rows_off + row * ROW.size, record.id, *refs)
+
+    # rows are sorted by id, so a position in the id table is also the row number
+    body[ids_off:ids_off + 8 * len(rows)] = array("q", (r.id for r in rows)).tobytes()
+
+    flat: array[int] = array("I")
+    for i, name in enumerate(names):
+        offset, length = heap.add(name)
+        NAME.pack_into(body, names_off + i * NAME.size, offset, length, len(flat), len(postings[name]))
+        flat.extend(postings[name])
+    body[postings_off:postings_off + 4 * len(flat)] = flat.tobytes()
+
+    HEADER.pack_into(
+        body, 0, MAGIC, len(rows), len(names),
+        rows_off, ids_off, names_off, postings_off, heap_off
+    )
+
+    return body, heap.data
+
+def write_snapshot(path: str, records: Iterable[Record]) -> None:
+    """
+    Writes records to a binary snapshot that already contains the id index, the sorted
+    name table and name -> row postings, so opening it requires no parsing.
+    """
+    body, heap = build_snapshot(records)
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(body)
+        f.write(heap)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp, path)
+
+class _Names(Sequence[str]):
+    """
+    Sorted name table decoded on access, lets bisect search the mapped buffer directly.
+    """
+
+    def __init__(self, snapshot: "Snapshot"):
+        self.snapshot: Snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self.snapshot.name_count
+
+    @overload
+    def __getitem__(self, i: int) -> str: ...
+    @overload
+    def __getitem__(self, i: slice) -> list[str]: ...
+
+    def __getitem__(self, i: int | slice) -> str | list[str]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        offset, length, _, _ = self.snapshot._name_entry(i)
+        name = self.snapshot._string(offset, length)
+        if name is None:
+            raise Exception(f"corrupt snapshot {self.snapshot.path}: name {i} is null")
+        return name
+
+class Snapshot:
+    """
+    Read-only dictionary backed by a memory mapped snapshot written by write_snapshot.
+
+    Opening only reads the header, lookups binary search the mapped id index and name table
+    and decode just the rows they return. Because the file is mapped rather than read, every
+    process that opens the same snapshot shares one copy in the page cache.
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self._file = open(path, "rb")
+        self._mm: mmap.mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._open(memoryview(self._mm))
+
+    def _open(self, buffer: memoryview) -> None:
+        self._buffer: memoryview = buffer
+        (
+            magic, self.record_count, self.name_count,
+            self._rows_off, ids_off, self._names_off, postings_off, self._heap_off
+        ) = HEADER.unpack_from(buffer, 0)
+
+        if magic != MAGIC:
+            raise Exception(f"not a dictionary snapshot: {self.path}")
+
+        self._ids: memoryview = buffer[ids_off:ids_off + 8 * self.record_count].cast("q")
+        self._postings: memoryview = buffer[postings_off:postings_off + 4 * self.record_count].cast("I")
+        self._names: _Names = _Names(self)
+        self._name_cache: tuple[str, ...] | None = None
+
+    def close(self) -> None:
+        for view in (self._ids, self._postings, self._buffer):
+            view.release()
+        self._close_buffer()
+
+    def _close_buffer(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def _string(self, offset: int, length: int) -> str | None:
+        if length == NULL:
+            return None
+        start = self._heap_off + offset
+        return str(self._buffer[start:start + length], "utf-8")
+
+    def _name_entry(self, i: int) -> tuple[int, int, int, int]:
+        return NAME.unpack_from(self._buffer, self._names_off + i * NAME.size)
+
+    def _row(self, row: int) -> Record:
+        id, *refs = ROW.unpack_from(self._buffer, self._rows_off + row * ROW.size)
+        fields = {
+            field: self._string(refs[2 * i], refs[2 * i + 1])
+            for i, field in enumerate(STRING_FIELDS)
+        }
+        # _fields_set passed explicitly, otherwise the unpacked fields could bind to it
+        return Record.model_construct(_fields_set=None, id=id, **fields)
+
+    def get(self, id: int) -> Record | None:
+        """
+        Returns the record with the given id, if any
+        """
+        i = bisect_left(self._ids, id)
+        if i < self.record_count and self._ids[i] == id:
+            return self._row(i)
+        return None
+
+    def records(self) -> Iterator[Record]:
+        """
+        Iterates every record in id order
+        """
+        for row in range(self.record_count):
+            yield self._row(row)
+
+    def names(self) -> tuple[str, ...]:
+        """
+        Returns the sorted table of distinct names, decoded once on first use
+        """
+        if self._name_cache is None:
+            self._name_cache = tuple(self._names)
+        return self._name_cache
+
+    def lookup(self, lookup_value: str) -> list[Record]:
+        """
+        Performs a direct lookup based on the 'name' field
+        """
+        i = bisect_left(self._names, lookup_value)
+        if i >= self.name_count or self._names[i] != lookup_value:
+            return []
+
+        _, _, start, count = self._name_entry(i)
+        return [self._row(self._postings[p]) for p in range(start, start + count)]
+
+    def fuzzy_lookup(self, lookup_value: str, threshold: int) -> list[Record]:
+        """
+        Performs a fuzzy lookup based on the 'name' field, see Dictionary.fuzzy_lookup
+        """
+        search_result = process.extractOne(lookup_value, self.names(), scorer=fuzz.WRatio)
+
+        if search_result is None:
+            return []
+        else:
+            best_match, score, _ = search_result
+            return self.lookup(best_match) if score >= threshold else []
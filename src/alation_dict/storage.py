@@ -1,8 +1,18 @@
 import json
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
 from enum import Enum
 from pathlib import Path
+from time import perf_counter
+from typing import TextIO
 
+from . import metrics
+from .jsonstream import iter_array
 from .record import Record
+from .search import TextIndex
+from .snapshot import Snapshot, write_snapshot
 
 class StorageType(Enum):
     """
@@ -18,19 +28,74 @@ class StorageType(Enum):
     in variants that need them to pass them downstream to read and write methods
 
     ex: CLOUD_FILE = {"bucket": "some_bucket", "auth": "creds"}
+
+    LOCAL_FILE paths ending in .ndjson or .jsonl are stored as newline delimited json
+    (one record per line) instead of a single json array. Both are read incrementally.
+
+    DB is a local SQLite file. Unlike the file options it supports incremental
+    upserts and indexed lookups by name and table without loading every record.
     """
     LOCAL_FILE = 0
     CLOUD_FILE = 1
     DB = 2
 
+FIELDS: tuple[str, ...] = tuple(Record.model_fields.keys())
+COLUMNS: str = ", ".join(FIELDS)
+NDJSON_SUFFIXES: tuple[str, ...] = (".ndjson", ".jsonl")
+READ_CHUNK_SIZE: int = 64 * 1024
+
 class Storage:
     """
     Abstraction over storage options. Responsibilites are limited to
     reading from and writing to the desired storage location.
+
+    Journal
+    -------
+    With journal=True (LOCAL_FILE only) changes are appended to '<path>.journal' as they happen
+    and the json file at 'path' becomes a snapshot. Reads replay the journal over the snapshot.
+    Once the journal grows past compact_threshold bytes it is folded into a new snapshot in the
+    background, which is swapped in with an atomic rename.
+
+    Snapshot
+    --------
+    With snapshot=True Dictionary.save() also writes a binary, memory mappable snapshot to
+    '<path>.snap' (see snapshot.Snapshot) that lookup-only processes can open near instantly,
+    along with the full text search index in '<path>.search'. Both are rewritten in full on every
+    save, so a save costs O(records) even when journaled or DB storage only writes the changes.
+    Enable it where saves are occasional (ex: after a sync) rather than after every few adds.
     """
-    def __init__(self, type: StorageType, path: str):
+    def __init__(
+        self,
+        type: StorageType,
+        path: str,
+        journal: bool = False,
+        compact_threshold: int = 64 * 1024 * 1024,
+        snapshot: bool = False
+    ):
+        if journal and type != StorageType.LOCAL_FILE:
+            raise Exception(f"journal not supported for {type.name}")
+
         self.type: StorageType = type
         self.path: str = path
+        self.journal: bool = journal
+        self.journal_path: str = f"{path}.journal"
+        self.compact_threshold: int = compact_threshold
+        self.snapshot: bool = snapshot
+        self.snapshot_path: str = f"{path}.snap"
+        self.text_index_path: str = f"{path}.search"
+        self.meta_path: str = f"{path}.meta"
+        self._db: sqlite3.Connection | None = None
+        self._journal_file: TextIO | None = None
+        self._journal_lock: threading.Lock = threading.Lock()
+        self._compaction: threading.Thread | None = None
+
+    @property
+    def ndjson(self) -> bool:
+        return self.path.endswith(NDJSON_SUFFIXES)
+
+    @property
+    def _compacting_path(self) -> str:
+        return f"{self.journal_path}.compacting"
 
     def read(self):
         """
@@ -38,43 +103,367 @@ class Storage:
         """
         match self.type:
             case StorageType.LOCAL_FILE:
-                return self._read_local_file()
+                records = self._read_local_file()
             case StorageType.CLOUD_FILE:
                 raise Exception("cloud file not supported yet")
             case StorageType.DB:
-                raise Exception("db not supported yet")
+                records = self._read_db()
+
+        return self._observe_read(records) if metrics.enabled() else records
 
     def write(self, records: list[Record]):
         """
         Writes to the specified storage location.
         """
+        with metrics.timer("storage_write_seconds", type=self.type.name):
+            match self.type:
+                case StorageType.LOCAL_FILE if self.journal:
+                    self._write_journaled_file(records)
+                case StorageType.LOCAL_FILE:
+                    self._write_local_file(records)
+                case StorageType.CLOUD_FILE:
+                    raise Exception("cloud file not supported yet")
+                case StorageType.DB:
+                    self._write_db(records)
+
+        self._observe_size()
+
+    def _observe_read(self, records: Iterator[Record]) -> Iterator[Record]:
+        # reads are lazy, so the duration covers consuming every record
+        start = perf_counter()
+        count = 0
+        for record in records:
+            count += 1
+            yield record
+        metrics.observe("storage_read_seconds", perf_counter() - start, type=self.type.name)
+        metrics.inc("storage_records_read_total", count, type=self.type.name)
+        self._observe_size()
+
+    def _observe_size(self) -> None:
+        if metrics.enabled() and self.type != StorageType.CLOUD_FILE and os.path.exists(self.path):
+            metrics.gauge("storage_file_bytes", os.path.getsize(self.path), type=self.type.name)
+
+    def upsert(self, records: Iterable[Record]):
+        """
+        Inserts or updates only the records provided, leaving everything else in place.
+        """
+        match self.type:
+            case StorageType.DB:
+                return self._write_db(records)
+            case StorageType.LOCAL_FILE if self.journal:
+                for record in records:
+                    self.append(record)
+                return self.sync()
+            case _:
+                raise Exception(f"upsert not supported for {self.type.name}")
+
+    def delete(self, ids: Iterable[int]):
+        """
+        Removes the records with the given ids, leaving everything else in place.
+        """
         match self.type:
-            case StorageType.LOCAL_FILE:
-                return self._write_local_file(records)
-            case StorageType.CLOUD_FILE:
-                raise Exception("cloud file not supported yet")
             case StorageType.DB:
-                raise Exception("db not supported yet")
+                return self._delete_db(ids)
+            case StorageType.LOCAL_FILE if self.journal:
+                for id in ids:
+                    self.append_removal(id)
+                return self.sync()
+            case _:
+                raise Exception(f"delete not supported for {self.type.name}")
+
+    def append(self, record: Record) -> None:
+        """
+        Appends a record to the change journal. The write is buffered, call sync() to make it durable.
+        """
+        self._append_journal(json.dumps(record.model_dump(), ensure_ascii=False) + "\n")
+
+    def append_removal(self, id: int) -> None:
+        """
+        Appends a removal (tombstone) to the change journal.
+        """
+        self._append_journal(json.dumps({"id": id, "deleted": True}) + "\n")
+
+    def _append_journal(self, line: str) -> None:
+        with self._journal_lock:
+            if self._journal_file is None:
+                self._truncate_torn_tail(self.journal_path)
+                self._journal_file = open(self.journal_path, "a", encoding="utf-8")
+            self._journal_file.write(line)
+
+    @staticmethod
+    def _truncate_torn_tail(path: str) -> None:
+        """
+        Cuts a journal back to its last complete line. A crash mid-append leaves a fragment with no
+        trailing newline, appending after it would glue the next entry onto the fragment.
+        """
+        if not os.path.exists(path):
+            return
+
+        with open(path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - READ_CHUNK_SIZE)
+                f.seek(start)
+                chunk = f.read(position - start)
+                newline = chunk.rfind(b"\n")
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+
+            if position != end:
+                f.truncate(position)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def sync(self) -> None:
+        """
+        Flushes and fsyncs the change journal, then starts a background compaction if the
+        journal has grown past the threshold.
+        """
+        with self._journal_lock:
+            if self._journal_file is None:
+                return
+            self._journal_file.flush()
+            os.fsync(self._journal_file.fileno())
+            size = self._journal_file.tell()
+
+        if size >= self.compact_threshold:
+            self.compact(wait=False)
+
+    def compact(self, wait: bool = True) -> None:
+        """
+        Folds the journal into a new snapshot. The journal is rotated first so appends can
+        continue while the old one is folded in on a background thread.
+        """
+        with self._journal_lock:
+            thread = self._compaction
+
+            if thread is None or not thread.is_alive():
+                if self._journal_file is not None:
+                    self._journal_file.flush()
+                    os.fsync(self._journal_file.fileno())
+                    self._journal_file.close()
+                    self._journal_file = None
+
+                # a leftover .compacting journal means a previous compaction never finished,
+                # fold that one in first and leave the current journal for next time
+                if os.path.exists(self.journal_path) and not os.path.exists(self._compacting_path):
+                    os.replace(self.journal_path, self._compacting_path)
+
+                thread = threading.Thread(target=self._compact, name="alation-dict-compaction")
+                thread.start()
+                self._compaction = thread
+
+        if wait:
+            thread.join()
+
+    def read_meta(self, key: str) -> str | None:
+        """
+        Reads a piece of bookkeeping (ex: the sync high-water mark) kept alongside the records.
+        """
+        if self.type == StorageType.DB:
+            row = self._connect_db().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f).get(key)
+        except FileNotFoundError:
+            return None
+
+    def write_meta(self, key: str, value: str) -> None:
+        """
+        Writes a piece of bookkeeping kept alongside the records.
+        """
+        if self.type == StorageType.DB:
+            db = self._connect_db()
+            with db:
+                db.execute("INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value", (key, value))
+            return
+
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            meta = {}
+
+        meta[key] = value
+        tmp = f"{self.meta_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self.meta_path)
+
+    def write_snapshot(self, records: Iterable[Record]) -> None:
+        """
+        Writes the binary snapshot next to the storage location.
+        """
+        write_snapshot(self.snapshot_path, records)
+
+    def open_snapshot(self) -> Snapshot:
+        """
+        Memory maps the binary snapshot written by write_snapshot.
+        """
+        return Snapshot(self.snapshot_path)
+
+    def write_text_index(self, index: TextIndex) -> None:
+        """
+        Persists the full text search index next to the storage location.
+        """
+        index.save(self.text_index_path)
+
+    def read_text_index(self) -> TextIndex | None:
+        """
+        Loads the persisted full text search index. Returns None if there isn't one or if the
+        records have been written since it was saved.
+        """
+        try:
+            saved = os.path.getmtime(self.text_index_path)
+        except OSError:
+            return None
+
+        for path in (self.path, self.journal_path):
+            if os.path.exists(path) and os.path.getmtime(path) > saved:
+                return None
+
+        return TextIndex.load(self.text_index_path)
+
+    def lookup(self, name: str) -> list[Record]:
+        """
+        Returns the records with the given 'name' straight from storage.
+        """
+        return self._query_db("name = ?", name)
+
+    def lookup_table(self, table_name: str) -> list[Record]:
+        """
+        Returns the records belonging to the given table straight from storage.
+        """
+        return self._query_db("table_name = ?", table_name)
+
+    def close(self) -> None:
+        """
+        Releases any open connection held by the storage backend.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+        if self._compaction is not None:
+            self._compaction.join()
+
+        with self._journal_lock:
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
 
     def _read_local_file(self):
         try:
             path: Path = Path(self.path)
             if not path.exists():
-                _ = path.write_text('[]', encoding="utf-8")
+                _ = path.write_text('' if self.ndjson else '[]', encoding="utf-8")
 
-            with open(path, "r", encoding="utf-8") as p:
-                records = json.load(p)
+            if self.journal:
+                yield from self._replay()
+                return
 
-            for record in records:
+            for record in self._read_snapshot():
                 yield Record.model_construct(**record)
         except:
             raise Exception(f"failed to read file at path {self.path}")
 
-    def _write_local_file(self, records: list[Record], write_to: str | None = None):
-        output = [record.model_dump() for record in records]
+    def _read_snapshot(self) -> Iterator[dict]:
+        """
+        Parses the file one record at a time so only a single record is decoded at once.
+        """
+        with open(self.path, "r", encoding="utf-8") as p:
+            if self.ndjson:
+                for line in p:
+                    if line.strip():
+                        yield json.loads(line)
+            else:
+                yield from iter_array(iter(lambda: p.read(READ_CHUNK_SIZE), ""))
+
+    def _write_local_file(self, records: Iterable[Record], write_to: str | None = None):
+        target = write_to or self.path
+        tmp = f"{target}.tmp"
+
+        # write next to the target and rename over it so a crash never leaves a partial file.
+        # records are serialized one at a time rather than building the whole document first
+        with open(tmp, "w", encoding="utf-8") as f:
+            if self.ndjson:
+                for record in records:
+                    f.write(json.dumps(record.model_dump(), ensure_ascii=False))
+                    f.write("\n")
+            else:
+                f.write("[")
+                for i, record in enumerate(records):
+                    if i:
+                        f.write(", ")
+                    f.write(json.dumps(record.model_dump(), ensure_ascii=False))
+                f.write("]")
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp, target)
+
+    def _read_journal(self, path: str) -> Iterator[tuple[int, Record | None]]:
+        """
+        Yields (id, record) journal entries, record is None for removals.
+        """
+        if not os.path.exists(path):
+            return
+
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    # a torn line from a crash mid-append, it was never synced so only it is lost
+                    continue
+                yield data["id"], None if data.get("deleted") else Record.model_construct(**data)
+
+    def _replay(self, journals: tuple[str, ...] | None = None) -> Iterator[Record]:
+        """
+        Yields the snapshot with the journal(s) applied on top. Later journal entries win.
+        """
+        pending: dict[int, Record | None] = {}
+        for journal in journals or (self._compacting_path, self.journal_path):
+            for id, record in self._read_journal(journal):
+                pending[id] = record
+
+        for data in self._read_snapshot():
+            if data["id"] not in pending:
+                yield Record.model_construct(**data)
+                continue
+
+            record = pending.pop(data["id"])
+            if record is not None:
+                yield record
 
-        with open(write_to or self.path, "w", encoding="utf-8") as f:
-            json.dump(output, f, ensure_ascii=False)
+        yield from (record for record in pending.values() if record is not None)
+
+    def _compact(self) -> None:
+        if not os.path.exists(self._compacting_path):
+            return
+        self._write_local_file(self._replay((self._compacting_path,)))
+        os.remove(self._compacting_path)
+
+    def _write_journaled_file(self, records: Iterable[Record]):
+        # a full rewrite supersedes everything in the journal
+        if self._compaction is not None:
+            self._compaction.join()
+
+        with self._journal_lock:
+            self._write_local_file(records)
+
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
+
+            for journal in (self.journal_path, self._compacting_path):
+                if os.path.exists(journal):
+                    os.remove(journal)
 
     def _read_cloud_file(self):
         pass
@@ -82,8 +471,48 @@ class Storage:
     def _write_cloud_file(self):
         pass
 
+    def _connect_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            columns = ", ".join(f"{field} TEXT" for field in FIELDS if field != "id")
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            with self._db:
+                self._db.execute(f"""
+                    CREATE TABLE IF NOT EXISTS records (
+                        id INTEGER PRIMARY KEY,
+                        {columns}
+                    )
+                """)
+                self._db.execute("CREATE INDEX IF NOT EXISTS records_name ON records (name)")
+                self._db.execute("CREATE INDEX IF NOT EXISTS records_table_name ON records (table_name)")
+                self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        return self._db
+
     def _read_db(self):
-        pass
+        cursor = self._connect_db().execute(f"SELECT {COLUMNS} FROM records")
 
-    def _write_db(self):
-        pass
+        for row in cursor:
+            yield Record.model_construct(**dict(zip(FIELDS, row)))
+
+    def _query_db(self, where: str, *args: str) -> list[Record]:
+        if self.type != StorageType.DB:
+            raise Exception(f"lookups not supported for {self.type.name}")
+
+        cursor = self._connect_db().execute(f"SELECT {COLUMNS} FROM records WHERE {where}", args)
+        return [Record.model_construct(**dict(zip(FIELDS, row))) for row in cursor]
+
+    def _delete_db(self, ids: Iterable[int]):
+        db = self._connect_db()
+        with db:
+            db.executemany("DELETE FROM records WHERE id = ?", ((id,) for id in ids))
+
+    def _write_db(self, records: Iterable[Record]):
+        # one transaction for the whole batch, rows are matched on id
+        placeholders = ", ".join("?" for _ in FIELDS)
+        updates = ", ".join(f"{field} = excluded.{field}" for field in FIELDS if field != "id")
+
+        db = self._connect_db()
+        with db:
+            db.executemany(
+                f"INSERT INTO records ({COLUMNS}) VALUES ({placeholders}) ON CONFLICT (id) DO UPDATE SET {updates}",
+                (tuple(getattr(record, field) for field in FIELDS) for record in records)
+            )
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlencode, urlparse
+
+COLUMN_PATH = "/integration/v2/column/"
+
+class StubServer:
+    """
+    Local stand-in for the Alation API. Serves a list of column objects from
+    /integration/v2/column/ using the same limit/skip paging and X-Next-Page header
+    as the real endpoint, so Client can be exercised without a network.
+
+    The 'fields' param projects the returned objects and ts_last_modified__gt filters
+    on each column's 'ts_last_modified' (iso timestamps compare as strings). ds_id,
+    table_id__gte and table_id__lt filter columns that have 'ds_id'/'table_id' keys.
+    Pages carry an ETag and requests with a matching If-None-Match get a 304.
+    Pages are capped at max_limit columns whatever limit is asked for, like a server side page size cap.
+    Bulk PATCH bodies are applied to the columns, bodies with an id in rejected_ids get a 400.
+
+    Usage
+    -----
+    with StubServer(columns) as stub:
+        client = Client("token", base_url=stub.url)
+    """
+
+    def __init__(self, columns: list[dict[str, Any]], default_limit: int = 100, max_limit: int | None = None):
+        self.columns: list[dict[str, Any]] = columns
+        self.default_limit: int = default_limit
+        self.max_limit: int | None = max_limit
+        self.request_count: int = 0
+        self.not_modified_count: int = 0
+        self.patches: list[list[dict[str, Any]]] = []
+        self.rejected_ids: set[int] = set()
+        self._faults: deque[tuple[int, dict[str, str]]] = deque()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def fail(self, status: int, times: int = 1, retry_after: str | None = None) -> None:
+        """
+        Queues error responses that are served before any further pages, ex: fail(429, retry_after="1")
+        """
+        headers = {"Retry-After": retry_after} if retry_after is not None else {}
+        with self._lock:
+            self._faults.extend((status, headers) for _ in range(times))
+
+    def page(self, query: dict[str, str]) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Returns the columns for a single page along with the next page path (if any)
+        """
+        limit = int(query.get("limit", self.default_limit))
+        if self.max_limit is not None:
+            limit = min(limit, self.max_limit)
+        skip = int(query.get("skip", 0))
+
+        columns = self.columns
+        since = query.get("ts_last_modified__gt")
+        if since:
+            columns = [c for c in columns if c.get("ts_last_modified", "") > since]
+
+        # datasource and table range filters only apply to columns that carry those keys
+        if "ds_id" in query:
+            columns = [c for c in columns if str(c.get("ds_id", query["ds_id"])) == query["ds_id"]]
+        if "table_id__gte" in query:
+            columns = [c for c in columns if c.get("table_id", 0) >= int(query["table_id__gte"])]
+        if "table_id__lt" in query:
+            columns = [c for c in columns if c.get("table_id", 0) < int(query["table_id__lt"])]
+
+        page = columns[skip:skip + limit]
+        if "fields" in query:
+            fields = query["fields"].split(",")
+            page = [{k: v for k, v in c.items() if k in fields} for c in page]
+
+        next_page = None
+        if skip + limit < len(columns):
+            next_page = f"{COLUMN_PATH}?{urlencode({**query, 'limit': limit, 'skip': skip + limit})}"
+
+        return page, next_page
+
+    def apply(self, body: list[dict[str, Any]]) -> int:
+        """
+        Applies a bulk PATCH body to the served columns, returns the number of columns updated
+        """
+        by_id = {c["id"]: c for c in self.columns}
+        updated = 0
+
+        for patch in body:
+            column = by_id.get(patch["id"])
+            if column is None:
+                continue
+
+            for key, value in patch.items():
+                if key == "custom_fields":
+                    fields = {f["field_id"]: f for f in column.setdefault("custom_fields", [])}
+                    for field in value:
+                        fields[field["field_id"]] = field
+                    column["custom_fields"] = list(fields.values())
+                elif key != "id":
+                    column[key] = value
+            updated += 1
+
+        self.patches.append(body)
+        return updated
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def fault(self) -> bool:
+                with stub._lock:
+                    stub.request_count += 1
+                    fault = stub._faults.popleft() if stub._faults else None
+
+                if fault:
+                    status, headers = fault
+                    self.send_response(status)
+                    for key, value in headers.items():
+                        self.send_header(key, value)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                return fault is not None
+
+            def do_PATCH(self) -> None:
+                if self.fault():
+                    return
+
+                if urlparse(self.path).path != COLUMN_PATH:
+                    self.send_error(404)
+                    return
+
+                length = int(self.headers.get("Content-Length", 0))
+                patch = json.loads(self.rfile.read(length))
+                # bulk bodies touching a rejected id fail as a whole, like a validation error would
+                if any(p["id"] in stub.rejected_ids for p in patch):
+                    self.send_error(400)
+                    return
+
+                with stub._lock:
+                    updated = stub.apply(patch)
+                body = json.dumps({"updated_objects": updated}).encode("utf-8")
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                if self.fault():
+                    return
+
+                parsed = urlparse(self.path)
+                if parsed.path != COLUMN_PATH:
+                    self.send_error(404)
+                    return
+
+                query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                page, next_page = stub.page(query)
+                body = json.dumps(page).encode("utf-8")
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+
+                if self.headers.get("If-None-Match") == etag:
+                    with stub._lock:
+                        stub.not_modified_count += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                if next_page:
+                    self.send_header("X-Next-Page", next_page)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
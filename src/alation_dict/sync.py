@@ -0,0 +1,76 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from .client import Client, Endpoint
+from .dictionary import Dictionary
+from .record import Record
+
+# storage meta key holding the time of the last successful sync
+HIGH_WATER_MARK = "sync_high_water_mark"
+
+# filter asking the column endpoint for columns modified after a timestamp
+MODIFIED_SINCE_PARAM = "ts_last_modified__gt"
+
+# the high-water mark is taken from the local clock before the crawl starts, so step it back
+# a little to cover clock skew between us and the server
+CLOCK_SKEW = timedelta(minutes=5)
+
+@dataclass
+class ChangeSet:
+    """
+    What a sync changed in the dictionary
+    """
+    added: list[Record] = field(default_factory=list)
+    updated: list[Record] = field(default_factory=list)
+    removed: list[Record] = field(default_factory=list)
+    high_water_mark: str | None = None
+    full: bool = False
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.updated) + len(self.removed)
+
+def sync(
+    client: Client,
+    dictionary: Dictionary,
+    endpoint: Endpoint = Endpoint.COLUMN,
+    params: dict[str, Any] | None = None,
+    full: bool = False
+) -> ChangeSet:
+    """
+    Brings the dictionary up to date with Alation and saves it.
+
+    The first sync (or full=True) crawls every column. Later syncs only ask for columns modified
+    since the high-water mark recorded in storage by the previous sync, then detect deletions with a
+    cheap id-only listing. The new high-water mark is only recorded once the dictionary has been saved,
+    so an interrupted sync is simply repeated next time.
+    """
+    storage = dictionary.storage
+    params = dict(params or endpoint.value)
+    since = None if full else storage.read_meta(HIGH_WATER_MARK)
+    started = (datetime.now(timezone.utc) - CLOCK_SKEW).isoformat()
+
+    changes = ChangeSet(high_water_mark=started, full=since is None)
+    seen: set[int] = set()
+
+    with dictionary.batch():
+        for record in client.get(endpoint, {**params, MODIFIED_SINCE_PARAM: since} if since else params):
+            seen.add(record.id)
+            match dictionary.add(record):
+                case "new":
+                    changes.added.append(record)
+                case "updated":
+                    changes.updated.append(record)
+
+        # a full crawl already saw every remote id, a delta needs a separate id-only pass
+        remote = seen if since is None else set(client.get_ids(endpoint, params))
+
+        for id in [id for id in dictionary.index.keys() if id not in remote]:
+            removed = dictionary.remove(id)
+            if removed is not None:
+                changes.removed.append(removed)
+
+    dictionary.save()
+    storage.write_meta(HIGH_WATER_MARK, started)
+
+    return changes
@@ -0,0 +1,134 @@
+from collections.abc import Iterable, Iterator, Mapping
+from rapidfuzz import fuzz, process
+
+from .record import Record
+
+# both indexes are split into this many buckets. publishing a new version only copies the
+# buckets a batch touched, every other bucket is shared with the previous version
+BUCKETS = 4096
+
+def _name_bucket(name: str) -> int:
+    return hash(name) % BUCKETS
+
+class DictionaryView:
+    """
+    Immutable, consistent version of a Dictionary, see Dictionary.snapshot().
+
+    Nothing in a view is modified after it is published, so any number of threads can read one
+    without locks while the dictionary keeps changing. Versions share their records and every
+    bucket a later batch didn't touch, so holding on to an old view only costs what changed since.
+
+    Note
+    ----
+    fuzzy_lookup scores every distinct name (like Snapshot.fuzzy_lookup) rather than using the
+    trigram index, which is mutable and belongs to the live dictionary.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        ids: tuple[dict[int, Record], ...],
+        names: tuple[dict[str, tuple[int, ...]], ...],
+        count: int,
+        name_list: tuple[str, ...] | None = None
+    ):
+        self.version: int = version
+        self._ids: tuple[dict[int, Record], ...] = ids
+        self._names: tuple[dict[str, tuple[int, ...]], ...] = names
+        self._count: int = count
+        self._name_list: tuple[str, ...] | None = name_list
+
+    @classmethod
+    def build(cls, index: Mapping[int, Record], name_index: Mapping[str, Iterable[int]], version: int = 0) -> "DictionaryView":
+        ids: list[dict[int, Record]] = [{} for _ in range(BUCKETS)]
+        for id, record in index.items():
+            ids[id % BUCKETS][id] = record
+
+        names: list[dict[str, tuple[int, ...]]] = [{} for _ in range(BUCKETS)]
+        for name, members in name_index.items():
+            names[_name_bucket(name)][name] = tuple(members)
+
+        return cls(version, tuple(ids), tuple(names), len(index))
+
+    def evolve(
+        self,
+        index: Mapping[int, Record],
+        name_index: Mapping[str, Iterable[int]],
+        touched_ids: Iterable[int],
+        touched_names: Iterable[str]
+    ) -> "DictionaryView":
+        """
+        Returns the next version, copying only the buckets holding the given ids and names
+        """
+        ids = list(self._ids)
+        copied: set[int] = set()
+        count = self._count
+
+        for id in touched_ids:
+            b = id % BUCKETS
+            if b not in copied:
+                ids[b] = dict(ids[b])
+                copied.add(b)
+
+            record = index.get(id)
+            if record is None:
+                count -= ids[b].pop(id, None) is not None
+            else:
+                count += id not in ids[b]
+                ids[b][id] = record
+
+        names = list(self._names)
+        copied.clear()
+        names_changed = False
+
+        for name in touched_names:
+            b = _name_bucket(name)
+            if b not in copied:
+                names[b] = dict(names[b])
+                copied.add(b)
+
+            members = name_index.get(name)
+            if members:
+                names_changed |= name not in names[b]
+                names[b][name] = tuple(members)
+            else:
+                names_changed |= names[b].pop(name, None) is not None
+
+        # the distinct name list is only rebuilt (lazily) when a name appeared or disappeared
+        name_list = None if names_changed else self._name_list
+        return DictionaryView(self.version + 1, tuple(ids), tuple(names), count, name_list)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, id: int) -> Record | None:
+        return self._ids[id % BUCKETS].get(id)
+
+    def records(self) -> Iterator[Record]:
+        for bucket in self._ids:
+            yield from bucket.values()
+
+    def names(self) -> tuple[str, ...]:
+        # computed from this version only, so a race between readers just builds the same tuple twice
+        if self._name_list is None:
+            self._name_list = tuple(name for bucket in self._names for name in bucket)
+        return self._name_list
+
+    def lookup(self, lookup_value: str) -> list[Record]:
+        """
+        Performs a direct lookup based on the 'name' field, see Dictionary.lookup
+        """
+        members = self._names[_name_bucket(lookup_value)].get(lookup_value, ())
+        return [self._ids[id % BUCKETS][id] for id in members]
+
+    def fuzzy_lookup(self, lookup_value: str, threshold: int) -> list[Record]:
+        """
+        Performs a fuzzy lookup based on the 'name' field, see Dictionary.fuzzy_lookup
+        """
+        search_result = process.extractOne(lookup_value, self.names(), scorer=fuzz.WRatio)
+
+        if search_result is None:
+            return []
+        else:
+            best_match, score, _ = search_result
+            return self.lookup(best_match) if score >= threshold else []
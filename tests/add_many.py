@@ -0,0 +1,39 @@
+import os
+from alation_dict import AddSummary, Dictionary, Record, Storage, StorageType
+
+"""
+Test to ensure add_many/batch report what happened to each record and leave the
+indexes (including the fuzzy name cache) in the same state as add()
+"""
+
+def record(id: int, name: str, title: str = "title"):
+    return Record.model_construct(
+        id=id,
+        name=name,
+        title=title,
+        description="description",
+        url="https://url.com",
+        table_name="table_name",
+        page_status="status",
+        phi="PHI",
+        pii="PII"
+    )
+
+dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, "test.json"))
+
+summary = dictionary.add_many([record(1, "coid"), record(2, "admit_date"), record(3, "coid")])
+assert summary == AddSummary(new=3, updated=0, unchanged=0), f"unexpected summary {summary}"
+
+summary = dictionary.add_many([record(1, "coid"), record(2, "admit_dt"), record(3, "coid", title="new")])
+assert summary == AddSummary(new=0, updated=2, unchanged=1), f"unexpected summary {summary}"
+
+with dictionary.batch() as summary:
+    dictionary.add(record(4, "discharge_date"))
+    dictionary.add(record(4, "discharge_date"))
+assert summary == AddSummary(new=1, updated=0, unchanged=1), f"unexpected summary {summary}"
+
+assert dictionary.lookup("admit_date") == [], "expected renamed record to leave its old name"
+assert dictionary.fuzzy_lookup("discharge_dat", threshold=90) == [record(4, "discharge_date")], "expected name cache to be rebuilt after the batch"
+assert dictionary.new_record_count == 4 and dictionary.updated_record_count == 2, "expected counters to include batched adds"
+
+os.remove("test.json")
@@ -0,0 +1,72 @@
+import os
+from alation_dict import Dictionary, Record, Storage, StorageType
+
+"""
+Test to ensure near-duplicate descriptions of similarly named columns are grouped,
+while exact duplicates and unrelated descriptions are left alone
+"""
+
+columns = [
+    (1, "coid", "Company operating identifier."),
+    (2, "coid", "Company operating identifier."),
+    (3, "COID", "company operating identifier (COID)"),
+    (4, "coid", "Company Operating Identifier"),
+    (5, "coid", "Facility code used by the billing system"),
+    (6, "admit_date", "Date the patient was admitted."),
+    (7, "admit_date", "Date the patient was admitted."),
+    (8, "AdmitDate", "Date that the patient was admitted"),
+    (9, "payer_id", "Identifier of the payer."),
+    (10, "plan_id", "Identifier of the payer."),
+]
+
+dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, "test.json"))
+dictionary.add_many(
+    Record.model_construct(
+        id=id,
+        name=name,
+        title="title",
+        description=description,
+        url=f"https://alation.medcity.net/attribute/{id}/",
+        table_name=f"table_{id}",
+        page_status="Approved",
+        phi=None,
+        pii=None
+    )
+    for id, name, description in columns
+)
+
+groups = dictionary.alignment_candidates(threshold=0.6)
+got = [sorted(r.id for r in g.records) for g in groups]
+
+assert got == [[1, 2, 3, 4], [6, 7, 8]], f"unexpected groups {got}"
+assert groups[0].name == "coid" and groups[0].canonical == "Company operating identifier.", "expected most common name/description"
+assert 0.6 <= groups[0].similarity <= 1, "expected similarity within the threshold"
+
+patched = groups[0].patch()
+assert {r.description for r in patched} == {"Company operating identifier."}, "expected patch to align descriptions"
+assert [r.id for r in patched] == [r.id for r in groups[0].records], "expected one patched copy per record"
+
+# only case/punctuation differences survive an exact threshold
+exact = [sorted(r.id for r in g.records) for g in dictionary.alignment_candidates(threshold=1.0)]
+assert exact == [[1, 2, 4]], f"unexpected groups at an exact threshold {exact}"
+
+# a large cluster of boilerplate variants collides in every band and ends up as one group
+boilerplate = Dictionary(Storage(StorageType.LOCAL_FILE, "test.json"))
+boilerplate.add_many(
+    Record.model_construct(
+        id=id,
+        name="etl_batch_id",
+        title="title",
+        description=f"This column is populated by the nightly ETL for table {id}. Contact data governance with questions.",
+        url=f"https://alation.medcity.net/attribute/{id}/",
+        table_name=f"table_{id}",
+        page_status="Approved",
+        phi=None,
+        pii=None
+    )
+    for id in range(500)
+)
+sizes = [len(g.records) for g in boilerplate.alignment_candidates(threshold=0.6)]
+assert sizes == [500], f"expected one group of boilerplate variants, got {sizes}"
+
+os.remove("test.json")
@@ -0,0 +1,42 @@
+import asyncio
+from alation_dict import AsyncClient, Client, Endpoint
+from alation_dict.stub import StubServer
+
+"""
+Test to ensure the async client returns the same records as the sync client,
+survives transient 429/5xx responses and crawls every page when the server caps
+the page size below the requested limit
+"""
+
+columns = [
+    {
+        "id": i,
+        "name": f"column_{i}",
+        "title": f"title {i}",
+        "description": f"<p>description {i}</p>",
+        "url": f"/attribute/{i}/",
+        "table_name": f"table_{i % 7}",
+        "custom_fields": [{"field_id": 10045, "value": "Approved"}]
+    }
+    for i in range(1, 101)
+]
+
+async def crawl(url: str):
+    async with AsyncClient("token", base_url=url, max_concurrency=3, rate_limit=200, backoff_base=0.01, page_size=15) as client:
+        return [record async for record in client.get(Endpoint.COLUMN)]
+
+with StubServer(columns) as stub:
+    expected = list(Client("token", base_url=stub.url).get(Endpoint.COLUMN))
+
+    stub.fail(503, times=2)
+    stub.fail(429, retry_after="0")
+    got = asyncio.run(crawl(stub.url))
+
+assert got == expected, "expected async crawl to match sync crawl"
+assert [r.id for r in got] == list(range(1, 101)), "expected records in page order"
+
+# the server returns at most 10 columns per page whatever limit is asked for
+with StubServer(columns, max_limit=10) as stub:
+    capped = asyncio.run(crawl(stub.url))
+
+assert [r.id for r in capped] == list(range(1, 101)), f"expected every column once and in order from a capped server, got {len(capped)}"
@@ -0,0 +1,54 @@
+import os
+from alation_dict import Dictionary, Record, Storage, StorageType
+
+"""
+Test to ensure a compact dictionary returns the same results as the default one
+through adds, updates and name changes
+"""
+
+def record(id: int, name: str, description: str = "description", phi: str | None = "No"):
+    return Record.model_construct(
+        id=id,
+        name=name,
+        title="title",
+        description=description,
+        url=f"https://alation.medcity.net/attribute/{id}/",
+        table_name=f"table_{id % 3}",
+        page_status="Approved",
+        phi=phi,
+        pii=None
+    )
+
+default = Dictionary(Storage(StorageType.LOCAL_FILE, "test_default.json"))
+compact = Dictionary(Storage(StorageType.LOCAL_FILE, "test_compact.json"), compact=True)
+
+updates = [
+    record(1, "coid"),
+    record(2, "coid", "other description"),
+    record(3, "admit_date", phi="Yes"),
+    record(1, "coid"),                          # unchanged
+    record(2, "coid", "new description"),       # updated
+    record(3, "admit_dt", phi="Yes"),           # renamed
+]
+
+for r in updates:
+    default.add(r)
+    compact.add(r)
+
+for name in ("coid", "admit_date", "admit_dt"):
+    expected = sorted(default.lookup(name), key=lambda r: r.id)
+    got = sorted(compact.lookup(name), key=lambda r: r.id)
+    assert got == expected, f"expected {expected} got {got}"
+
+assert sorted(compact.records(), key=lambda r: r.id) == sorted(default.records(), key=lambda r: r.id), "expected identical records"
+assert compact.new_record_count == 3 and compact.updated_record_count == 2, "expected same add outcomes"
+
+compact.save()
+reloaded = Dictionary(Storage(StorageType.LOCAL_FILE, "test_compact.json"), compact=True)
+assert reloaded.lookup("admit_dt") == default.lookup("admit_dt"), "expected compact dictionary to round trip through storage"
+
+del compact.index[1]
+assert 1 not in compact.index and compact.index[3] == default.index[3], "expected delete to keep remaining rows intact"
+
+os.remove("test_default.json")
+os.remove("test_compact.json")
@@ -0,0 +1,37 @@
+from alation_dict import Client, Endpoint
+from alation_dict.stub import StubServer
+
+"""
+Test to ensure a concurrent crawl returns the same records, in the same order,
+as a sequential crawl that follows X-Next-Page, including when the server caps
+the page size below the requested limit
+"""
+
+columns = [
+    {
+        "id": i,
+        "name": f"column_{i}",
+        "title": f"title {i}",
+        "description": f"<p>description {i}</p>",
+        "url": f"/attribute/{i}/",
+        "table_name": f"table_{i % 7}",
+        "custom_fields": [{"field_id": 10030, "value": "No"}]
+    }
+    for i in range(1, 251)
+]
+
+with StubServer(columns) as stub:
+    sequential = list(Client("token", base_url=stub.url, page_size=20).get(Endpoint.COLUMN, {"limit": 20}))
+
+    stub.request_count = 0
+    concurrent = list(Client("token", base_url=stub.url, max_workers=4, page_size=20).get(Endpoint.COLUMN))
+
+assert [r.id for r in sequential] == list(range(1, 251)), "expected sequential crawl to return every column in order"
+assert concurrent == sequential, "expected concurrent crawl to match sequential crawl"
+assert stub.request_count <= 13 + 4, f"expected at most one window of extra requests, got {stub.request_count}"
+
+# the server returns at most 15 columns per page whatever limit is asked for
+with StubServer(columns, max_limit=15) as stub:
+    capped = list(Client("token", base_url=stub.url, max_workers=4, page_size=20).get(Endpoint.COLUMN))
+
+assert [r.id for r in capped] == list(range(1, 251)), f"expected every column once and in order from a capped server, got {len(capped)}"
@@ -0,0 +1,63 @@
+import os
+from datetime import datetime, timezone
+from alation_dict import Client, Dictionary, Storage, StorageType, sync
+from alation_dict.stub import StubServer
+
+"""
+Test to ensure a delta sync only pulls columns modified since the last sync, detects
+deletions and persists the result (including removals) to storage
+"""
+
+def column(i: int, title: str = "title", ts: str = "2020-01-01T00:00:00+00:00"):
+    return {
+        "id": i,
+        "name": f"column_{i}",
+        "title": title,
+        "description": "description",
+        "url": f"/attribute/{i}/",
+        "table_name": "table",
+        "ts_last_modified": ts,
+        "custom_fields": []
+    }
+
+for path in ("test.json", "test.db"):
+    storage_type = StorageType.DB if path.endswith(".db") else StorageType.LOCAL_FILE
+
+    with StubServer([column(i) for i in range(1, 51)], default_limit=10) as stub:
+        client = Client("token", base_url=stub.url)
+
+        dictionary = Dictionary(Storage(storage_type, path))
+        first = sync(client, dictionary)
+        assert first.full and len(first.added) == 50 and not first.updated and not first.removed, f"{path}: unexpected first sync {len(first)}"
+
+        now = datetime.now(timezone.utc).isoformat()
+        stub.columns = [c for c in stub.columns if c["id"] != 7]    # deleted
+        stub.columns[2] = column(3, title="new title", ts=now)      # updated
+        stub.columns.append(column(51, ts=now))                     # added
+
+        dictionary = Dictionary(Storage(storage_type, path))
+        delta = sync(client, dictionary)
+
+    assert not delta.full, f"{path}: expected a delta sync"
+    assert [r.id for r in delta.added] == [51], f"{path}: expected column 51 to be added"
+    assert [r.id for r in delta.updated] == [3], f"{path}: expected column 3 to be updated"
+    assert [r.id for r in delta.removed] == [7], f"{path}: expected column 7 to be removed"
+
+    reloaded = Dictionary(Storage(storage_type, path))
+    assert sorted(reloaded.index) == sorted(c["id"] for c in stub.columns), f"{path}: expected storage to match the server"
+    assert reloaded.lookup("column_3")[0].title == "new title", f"{path}: expected update to be saved"
+    assert reloaded.lookup("column_7") == [], f"{path}: expected removal to be saved"
+
+    # the fuzzy name list is only rebuilt when a removal drops a name's last record
+    reloaded.add(reloaded.index[1].model_copy(update={"id": 100}))
+    names = reloaded._names()
+    reloaded.remove(100)
+    assert reloaded._names() is names, f"{path}: expected a shared name to keep the name list"
+    reloaded.remove(1)
+    assert "column_1" not in reloaded._names(), f"{path}: expected the last record's name to leave the name list"
+
+    reloaded.storage.close()
+    dictionary.storage.close()
+    os.remove(path)
+    if os.path.exists(f"{path}.meta"):
+        os.remove(f"{path}.meta")
@@ -0,0 +1,54 @@
+from bs4 import BeautifulSoup
+from alation_dict import Record
+
+"""
+Test to ensure the fast/cached description cleaning produces exactly the same
+output as parsing every description with BeautifulSoup
+"""
+
+corpus = [
+    "",
+    "   ",
+    "plain text",
+    "  padded plain text \n",
+    "line one\r\nline two\ttabbed",
+    "a > b but not a tag",
+    "non breaking space ",
+    "<p>simple paragraph</p>",
+    "<p>  spaced  </p><p> second </p>",
+    "<div><p>nested <b>bold</b> and <i>italic</i></p></div>",
+    "Tom &amp; Jerry",
+    "&lt;not a tag&gt;",
+    "&nbsp;leading entity",
+    "unknown &entity; and bare & ampersand",
+    "<br>",
+    "<p>unclosed <b>tags",
+    "stray </p> close",
+    "<!-- comment -->visible",
+    "<script>var x = 1;</script>after script",
+    "<a href=\"https://example.com\">link</a> text",
+    "<ul><li>one</li><li>two</li></ul>",
+    "a < b and c > d",
+    "<p>Patient admit date (local time)</p>",
+    "<p>Patient admit date (local time)</p>",
+]
+
+def column(i: int, description: str):
+    return {
+        "id": i,
+        "name": f"column_{i}",
+        "title": "title",
+        "description": description,
+        "url": f"/attribute/{i}/",
+        "table_name": "table",
+        "custom_fields": []
+    }
+
+for i, html in enumerate(corpus):
+    expected = BeautifulSoup(html, "html.parser").get_text(strip=True)
+    got = Record(**column(i, html)).description
+    assert got == expected, f"{html!r}: expected {expected!r} got {got!r}"
+
+singles = [Record(**column(i, html)) for i, html in enumerate(corpus)]
+batch = Record.validate_many(column(i, html) for i, html in enumerate(corpus))
+assert batch == singles, "expected validate_many to match validating one at a time"
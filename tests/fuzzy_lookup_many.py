@@ -0,0 +1,48 @@
+import os
+from rapidfuzz import fuzz, process, utils
+from alation_dict import Dictionary, Record, Storage, StorageType
+
+"""
+Test to ensure fuzzy_lookup_many returns the same top-k matches as scoring each
+query against the preprocessed names one at a time
+"""
+
+names = [
+    "coid", "COID", "facility_id", "admit_date", "admit_dt", "discharge_date",
+    "patient_id", "patient_mrn", "encounter_id", "encounter_type", "Admit-Date",
+]
+
+dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, "test.json"))
+dictionary.add_many(
+    Record.model_construct(
+        id=i,
+        name=name,
+        title="title",
+        description="description",
+        url="https://url.com",
+        table_name="table_name",
+        page_status="status",
+        phi=None,
+        pii=None
+    )
+    for i, name in enumerate(names)
+)
+
+queries = ["admit date", "PATIENT_ID", "encountr", "zzzz", "coid"]
+got = dictionary.fuzzy_lookup_many(queries, threshold=60, limit=3)
+
+assert len(got) == len(queries), "expected one result list per query"
+
+processed = [utils.default_process(name) for name in names]
+for query, matches in zip(queries, got):
+    expected = process.extract(utils.default_process(query), processed, scorer=fuzz.WRatio, limit=3, score_cutoff=60)
+    assert [(m.name, round(m.score, 3)) for m in matches] == [(names[i], round(score, 3)) for _, score, i in expected], (
+        f"{query}: expected {expected} got {matches}"
+    )
+    for match in matches:
+        assert match.records == dictionary.lookup(match.name), "expected records for each matched name"
+
+assert got[3] == [], "expected no matches below the threshold"
+assert {m.name for m in got[4][:2]} == {"coid", "COID"}, "expected case-insensitive matching"
+
+os.remove("test.json")
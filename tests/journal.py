@@ -0,0 +1,81 @@
+import json
+import os
+from alation_dict import Dictionary, Record, Storage, StorageType
+
+"""
+Test to ensure journaled storage persists changes without rewriting the snapshot,
+replays them on load and folds them into the snapshot on compaction
+"""
+
+def record(id: int, name: str, title: str = "title"):
+    return Record.model_construct(
+        id=id,
+        name=name,
+        title=title,
+        description="description",
+        url=f"https://alation.medcity.net/attribute/{id}/",
+        table_name="table_name",
+        page_status="Approved",
+        phi=None,
+        pii=None
+    )
+
+def load(**kwargs):
+    return Dictionary(Storage(StorageType.LOCAL_FILE, "test.json", journal=True, **kwargs))
+
+dictionary = load()
+dictionary.add(record(1, "coid"))
+dictionary.add(record(2, "admit_date"))
+dictionary.save()
+
+with open("test.json", encoding="utf-8") as f:
+    assert json.load(f) == [], "expected save to leave the snapshot untouched"
+
+dictionary.add(record(2, "admit_dt", title="renamed"))
+dictionary.save()
+dictionary.storage.close()
+
+# simulate a crash in the middle of an append
+with open("test.json.journal", "a", encoding="utf-8") as f:
+    f.write('{"id": 3, "name": "torn')
+
+reloaded = load()
+assert reloaded.lookup("coid") == [record(1, "coid")], "expected journaled record to be replayed"
+assert reloaded.lookup("admit_date") == [], "expected stale name to be gone after replay"
+assert reloaded.lookup("admit_dt") == [record(2, "admit_dt", title="renamed")], "expected latest journal entry to win"
+assert len(reloaded.records()) == 2, "expected torn line to be ignored"
+
+reloaded.storage.compact()
+assert not os.path.exists("test.json.journal"), "expected journal to be folded into the snapshot"
+with open("test.json", encoding="utf-8") as f:
+    assert sorted(r["id"] for r in json.load(f)) == [1, 2], "expected snapshot to hold every record"
+
+# a tiny threshold forces a background compaction on save
+small = load(compact_threshold=1)
+small.add(record(4, "discharge_date"))
+small.save()
+small.storage.close()
+assert not os.path.exists("test.json.journal.compacting"), "expected background compaction to finish"
+assert sorted(r.id for r in load().records()) == [1, 2, 4], "expected every record after compaction"
+
+# a torn tail followed by new writes, the new entries must not be glued onto the fragment
+with open("test.json.journal", "a", encoding="utf-8") as f:
+    f.write('{"id": 6, "name": "torn')
+
+torn = load()
+torn.add(record(5, "admit_source"))
+torn.save()
+torn.storage.close()
+assert sorted(r.id for r in load().records()) == [1, 2, 4, 5], "expected writes after a torn tail to survive"
+with open("test.json.journal", encoding="utf-8") as f:
+    assert all(json.loads(line) for line in f), "expected the torn fragment to be cut from the journal"
+
+# a torn line in the middle (written before the tail was repaired) only loses that line
+with open("test.json.journal", "a", encoding="utf-8") as f:
+    f.write('{"id": 7, "na\n')
+    f.write(json.dumps(record(8, "admit_type").model_dump()) + "\n")
+assert sorted(r.id for r in load().records()) == [1, 2, 4, 5, 8], "expected entries after a torn line to be replayed"
+
+for path in ("test.json", "test.json.journal"):
+    if os.path.exists(path):
+        os.remove(path)
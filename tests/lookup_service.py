@@ -0,0 +1,99 @@
+import csv
+import json
+import os
+import threading
+import time
+from click.testing import CliRunner
+from alation_dict import Dictionary, LookupService, Record, ServiceClient, Storage, StorageType
+from alation_dict.cli import main
+from alation_dict.export import ExportFormat
+
+"""
+Test to ensure the lookup service answers lookups, fuzzy lookups and exports concurrently over
+http and a unix socket, and hot reloads the dictionary when its storage file changes
+"""
+
+def record(i: int, name: str | None = None):
+    return Record.model_construct(
+        id=i, name=name or f"column_{i}", title="title", description="description",
+        url=f"https://alation/attribute/{i}/", table_name="table", phi=None, pii=None, page_status=None
+    )
+
+path = "test.json"
+socket_path = "test.sock"
+
+dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, path))
+dictionary.add_many(record(i) for i in range(1, 101))
+dictionary.save()
+
+with LookupService(Storage(StorageType.LOCAL_FILE, path), port=0, poll_interval=0.05).start() as service:
+    with ServiceClient(service.url) as client:
+        assert [r.id for r in client.lookup("column_7")] == [7]
+        assert client.lookup("missing") == []
+        assert [r.id for r in client.fuzzy_lookup("colum_42", threshold=80)] == [42]
+        assert client.health()["records"] == 100
+
+        client.export("test_export.csv", ExportFormat.CSV, columns=["id", "name"])
+        with open("test_export.csv", newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["id", "name"] and len(rows) == 101
+
+        # the client reconnects after the export closed its connection
+        assert [r.id for r in client.lookup("column_8")] == [8]
+
+        try:
+            client.export("test_export.parquet", ExportFormat.PARQUET)
+        except Exception as e:
+            assert "400" in str(e)
+        else:
+            raise AssertionError("expected parquet to be rejected")
+
+    # concurrent clients
+    errors = []
+    def worker(n: int):
+        try:
+            with ServiceClient(service.url) as c:
+                for i in range(1, 51):
+                    assert [r.id for r in c.lookup(f"column_{i}")] == [i]
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors, errors
+
+    # the storage file changes, the service swaps in a new dictionary
+    time.sleep(0.01)
+    dictionary.add(record(101, "brand_new"))
+    dictionary.save()
+
+    deadline = time.time() + 5
+    with ServiceClient(service.url) as client:
+        while not client.lookup("brand_new") and time.time() < deadline:
+            time.sleep(0.05)
+        assert [r.id for r in client.lookup("brand_new")] == [101]
+        assert client.health()["reloads"] == 1
+
+# over a unix socket, driven through the cli
+with LookupService(Storage(StorageType.LOCAL_FILE, path), socket_path=socket_path).start():
+    runner = CliRunner()
+    result = runner.invoke(main, ["lookup", "column_3", "--socket", socket_path])
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)["id"] == 3
+
+    result = runner.invoke(main, ["lookup", "brand nw", "--fuzzy", "--socket", socket_path])
+    assert result.exit_code == 0 and json.loads(result.output)["id"] == 101, result.output
+
+    result = runner.invoke(main, ["export", "test_export.ndjson", "--columns", "id", "--socket", socket_path])
+    assert result.exit_code == 0, result.output
+    with open("test_export.ndjson", encoding="utf-8") as f:
+        assert sum(1 for _ in f) == 101
+
+    result = runner.invoke(main, ["health", "--socket", socket_path])
+    assert json.loads(result.output)["records"] == 101
+
+assert not os.path.exists(socket_path)
+for p in (path, "test_export.csv", "test_export.ndjson"):
+    os.remove(p)
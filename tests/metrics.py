@@ -0,0 +1,91 @@
+import os
+from alation_dict import Client, Dictionary, Endpoint, InMemoryCollector, PrometheusExporter, Storage, StorageType, metrics
+from alation_dict.metrics import Histogram
+from alation_dict.stub import StubServer
+
+"""
+Test to ensure instrumentation is off by default, and once a sink is installed the client,
+record validation, storage and dictionary report to it and can be exported for prometheus
+"""
+
+columns = [
+    {
+        "id": i,
+        "name": f"column_{i % 20}",
+        "title": "title",
+        "description": "<p>description</p>",
+        "url": f"/attribute/{i}/",
+        "table_name": "table",
+        "custom_fields": []
+    }
+    for i in range(1, 101)
+]
+
+path = "test.json"
+collector = InMemoryCollector()
+
+with StubServer(columns, default_limit=25) as stub:
+    # nothing is measured without a sink
+    list(Client("token", base_url=stub.url).get(Endpoint.COLUMN, {"limit": 25}))
+    assert not metrics.enabled() and not collector.counters
+
+    metrics.set_sink(collector)
+    try:
+        for workers in (1, 4):
+            records = list(Client("token", base_url=stub.url, max_workers=workers).get(Endpoint.COLUMN, {"limit": 25}))
+            assert len(records) == 100
+
+        dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, path))
+        dictionary.add_many(records)
+        dictionary.add(records[0])
+        dictionary.save()
+
+        dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, path))
+        for name in ("column_1", "column_2", "missing"):
+            dictionary.lookup(name)
+        dictionary.fuzzy_lookup("colum_3", threshold=80)
+    finally:
+        metrics.set_sink(None)
+
+# 4 pages sequentially, at least 4 concurrently (the last window may overshoot)
+pages = collector.get("client_pages_total")
+assert pages is not None and pages >= 8, pages
+requests = collector.get("client_request_seconds")
+assert isinstance(requests, Histogram) and requests.count == pages
+bytes_read = collector.get("client_response_bytes_total")
+assert bytes_read is not None and bytes_read > 0
+
+assert collector.get("records_validated_total") == 200, collector.get("records_validated_total")
+assert collector.get("record_validation_records_per_second") is not None
+
+assert collector.get("dictionary_adds_total", outcome="new") == 100
+assert collector.get("dictionary_adds_total", outcome="unchanged") == 1
+
+# fuzzy_lookup finishes with a direct lookup of the best match
+lookups = collector.get("dictionary_lookup_seconds")
+assert isinstance(lookups, Histogram) and lookups.count == 4, lookups
+fuzzy = collector.get("dictionary_fuzzy_lookup_seconds")
+assert isinstance(fuzzy, Histogram) and fuzzy.count == 1
+
+build = collector.get("dictionary_index_build_seconds")
+assert isinstance(build, Histogram) and build.count == 2
+
+assert collector.get("storage_write_seconds", type="LOCAL_FILE") is not None
+assert collector.get("storage_read_seconds", type="LOCAL_FILE") is not None
+assert collector.get("storage_file_bytes", type="LOCAL_FILE") == os.path.getsize(path)
+assert collector.get("dictionary_records") == 100
+
+text = PrometheusExporter(collector).render()
+assert "# TYPE alation_dict_client_pages_total counter" in text
+assert 'alation_dict_dictionary_adds_total{outcome="new"} 100' in text
+assert 'alation_dict_dictionary_lookup_seconds_bucket{le="+Inf"} 4' in text
+assert "alation_dict_dictionary_lookup_seconds_count 4" in text
+
+# buckets are cumulative
+counts = [
+    int(line.rsplit(" ", 1)[1]) for line in text.splitlines()
+    if line.startswith("alation_dict_dictionary_lookup_seconds_bucket")
+]
+assert counts == sorted(counts), counts
+
+os.remove(path)
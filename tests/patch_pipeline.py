@@ -0,0 +1,80 @@
+import os
+from alation_dict import Client, Dictionary, Endpoint, Record, Storage, StorageType
+from alation_dict.stub import StubServer
+
+"""
+Test to ensure Client.patch skips no-op patches, sends only changed fields in bulk
+payloads, supports dry runs and applies confirmed patches back into the dictionary
+"""
+
+columns = [
+    {
+        "id": i,
+        "name": "coid",
+        "title": "best title" if i % 4 == 0 else f"title {i}",
+        "description": "description",
+        "url": f"/attribute/{i}/",
+        "table_name": f"table_{i}",
+        "custom_fields": [{"field_id": 10030, "value": "No"}]
+    }
+    for i in range(1, 21)
+]
+
+with StubServer(columns) as stub:
+    client = Client("token", base_url=stub.url, max_workers=3)
+    dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, "test.json"))
+    dictionary.add_many(client.get(Endpoint.COLUMN))
+
+    changes = {"title": "best title", "pii": "No"}
+    patched = Record.patch_batch(dictionary.lookup("coid"), changes)
+
+    preview = client.patch(Endpoint.COLUMN, patched, dictionary, dry_run=True)
+    assert len(preview) == 20 and stub.patches == [], "expected dry run to send nothing"
+    assert all(dict(p.changes)["pii"] == (None, "No") for p in preview), "expected pii diff for every record"
+    assert sum("title" in p.changes for p in preview) == 15, "expected records already titled to skip the title"
+
+    sent = client.patch(Endpoint.COLUMN, patched, dictionary, batch_size=6)
+    assert sent == preview, "expected the same patches as the dry run"
+    assert sorted(len(batch) for batch in stub.patches) == [2, 6, 6, 6], f"expected bulk payloads, got {[len(b) for b in stub.patches]}"
+    assert all(set(p) <= {"id", "title", "custom_fields"} for batch in stub.patches for p in batch), "expected only changed fields to be sent"
+
+    assert all(r.title == "best title" and r.pii == "No" for r in dictionary.lookup("coid")), "expected patches applied to the dictionary"
+
+    refetched = sorted(client.get(Endpoint.COLUMN), key=lambda r: r.id)
+    assert refetched == sorted(dictionary.lookup("coid"), key=lambda r: r.id), "expected dictionary to match the server without a re-fetch"
+
+    stub.patches.clear()
+    assert client.patch(Endpoint.COLUMN, patched, dictionary) == [] and stub.patches == [], "expected no-op patches to be skipped"
+
+# one failing batch in the middle, the batches around it are still applied
+with StubServer(columns) as stub:
+    client = Client("token", base_url=stub.url, max_workers=3)
+    dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, "test.json"))
+    dictionary.add_many(client.get(Endpoint.COLUMN))
+
+    stub.rejected_ids = {9}
+    patched = Record.patch_batch(sorted(dictionary.lookup("coid"), key=lambda r: r.id), {"description": "patched"})
+
+    try:
+        client.patch(Endpoint.COLUMN, patched, dictionary, batch_size=4)
+    except Exception as e:
+        assert "1 of 5 patch batches failed" in str(e) and "ids 9..12" in str(e), f"expected the failed batch to be reported, got {e}"
+    else:
+        raise AssertionError("expected a failed batch to raise")
+
+    assert len(stub.patches) == 4, f"expected the other batches to reach the server, got {len(stub.patches)}"
+    applied = {r.id for r in dictionary.lookup("coid") if r.description == "patched"}
+    assert applied == set(range(1, 21)) - {9, 10, 11, 12}, f"expected every confirmed batch applied locally, got {sorted(applied)}"
+
+    stub.rejected_ids.clear()
+    retried = client.patch(Endpoint.COLUMN, patched, dictionary, batch_size=4)
+    assert sorted(p.id for p in retried) == [9, 10, 11, 12], "expected a retry to resend only the failed batch"
+
+try:
+    client.patch(Endpoint.COLUMN, [Record.patch(patched[0], {"name": "other"})], dictionary, dry_run=True)
+except Exception:
+    pass
+else:
+    raise AssertionError("expected patching a read-only field to raise")
+
+os.remove("test.json")
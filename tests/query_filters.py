@@ -0,0 +1,58 @@
+import os
+from alation_dict import Dictionary, Not, Record, Storage, StorageType
+
+"""
+Test to ensure query() answers composed filters the same way as scanning every
+record, including after updates move records between index values
+"""
+
+def record(id: int, name: str, table_name: str, phi: str | None, page_status: str | None):
+    return Record.model_construct(
+        id=id,
+        name=name,
+        title="title",
+        description="description",
+        url=f"https://alation.medcity.net/attribute/{id}/",
+        table_name=table_name,
+        page_status=page_status,
+        phi=phi,
+        pii=None
+    )
+
+dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, "test.json"))
+dictionary.add_many(
+    record(i, f"column_{i % 5}", ["encounter", "facility", "payer"][i % 3], ["Yes", "No", None][i % 4 % 3], ["Approved", "Draft", None][i % 2])
+    for i in range(60)
+)
+# move a record between index values
+dictionary.add(record(0, "column_0", "payer", "No", "Draft"))
+
+def scan(predicate) -> list[Record]:
+    return sorted((r for r in dictionary.records() if predicate(r)), key=lambda r: r.id)
+
+cases = [
+    ({"phi": "Yes"}, lambda r: r.phi == "Yes"),
+    ({"phi": None}, lambda r: r.phi is None),
+    ({"table_name": ["encounter", "facility"], "phi": "Yes", "page_status": Not("Approved")},
+        lambda r: r.table_name in ("encounter", "facility") and r.phi == "Yes" and r.page_status != "Approved"),
+    ({"name": "column_1", "table_name": "payer"}, lambda r: r.name == "column_1" and r.table_name == "payer"),
+    ({"pii": Not(None)}, lambda r: r.pii is not None),
+    ({"table_name": Not(["payer", "facility"])}, lambda r: r.table_name not in ("payer", "facility")),
+    ({}, lambda r: True),
+]
+
+for filters, predicate in cases:
+    expected = scan(predicate)
+    got = dictionary.query(**filters)
+    assert got == expected, f"{filters}: expected {[r.id for r in expected]} got {[r.id for r in got]}"
+
+assert 0 not in dictionary.field_index["table_name"]["encounter"], "expected update to leave the old index value"
+
+try:
+    dictionary.query(description="x")
+except Exception:
+    pass
+else:
+    raise AssertionError("expected unindexed field to raise")
+
+os.remove("test.json")
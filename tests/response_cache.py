@@ -0,0 +1,70 @@
+import os
+import shutil
+from alation_dict import CacheMode, Client, Endpoint, ResponseCache
+from alation_dict.stub import StubServer
+
+"""
+Test to ensure cached pages are revalidated with If-None-Match, a 304 reuses the cached
+records, changed pages are refetched and a recorded crawl replays without a server
+"""
+
+def column(i: int, title: str = "title"):
+    return {
+        "id": i,
+        "name": f"column_{i}",
+        "title": title,
+        "description": "<p>description</p>",
+        "url": f"/attribute/{i}/",
+        "table_name": "table",
+        "custom_fields": []
+    }
+
+directory = "test_cache"
+
+shutil.rmtree(directory, ignore_errors=True)
+
+with StubServer([column(i) for i in range(1, 26)], default_limit=10) as stub:
+    for workers in (1, 3):
+        recorded = len(os.listdir(directory)) if os.path.exists(directory) else 0
+        client = Client("token", base_url=stub.url, max_workers=workers, page_size=10, cache=ResponseCache(directory))
+        params = {"limit": 10}
+
+        # first crawl records every page
+        first = list(client.get(Endpoint.COLUMN, params))
+        assert [r.id for r in first] == list(range(1, 26))
+        assert first[0].description == "description" and first[0].url.endswith("/attribute/1/")
+        # the concurrent crawl may also request (and cache) the empty page past the end
+        pages = len(os.listdir(directory)) - recorded
+        assert pages == 3 if workers == 1 else pages >= 3, pages
+
+        # an unchanged server answers every page with a 304, records come from the cache
+        before = stub.not_modified_count
+        second = list(client.get(Endpoint.COLUMN, params))
+        assert second == first
+        assert stub.not_modified_count - before >= 3 if workers > 1 else stub.not_modified_count - before == 3
+
+        # a changed page is refetched, the others are still not modified
+        stub.columns[12] = column(13, title="new title")
+        before = stub.not_modified_count
+        third = list(client.get(Endpoint.COLUMN, params))
+        assert third[12].title == "new title"
+        assert stub.not_modified_count - before >= 2 if workers > 1 else stub.not_modified_count - before == 2
+        stub.columns[12] = column(13)
+
+    ids = list(client.get_ids(Endpoint.COLUMN, params))
+    assert ids == list(range(1, 26))
+
+# the server is gone, replay serves the recorded crawl (from any base url)
+for workers in (1, 3):
+    replay = Client("token", base_url="http://127.0.0.1:9/", max_workers=workers, page_size=10, cache=ResponseCache(directory, mode=CacheMode.REPLAY))
+    assert [r.id for r in replay.get(Endpoint.COLUMN, {"limit": 10})] == list(range(1, 26))
+    assert list(replay.get_ids(Endpoint.COLUMN, {"limit": 10})) == list(range(1, 26))
+
+try:
+    list(replay.get(Endpoint.COLUMN, {"limit": 5}))
+except Exception as e:
+    assert "no recorded response" in str(e)
+else:
+    raise AssertionError("expected missing recording error")
+
+shutil.rmtree(directory)
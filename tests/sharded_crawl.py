@@ -0,0 +1,53 @@
+import os
+from alation_dict import Client, Dictionary, Shard, Storage, StorageType, crawl
+from alation_dict.stub import StubServer
+
+"""
+Test to ensure a crawl split across datasources and table id ranges is fetched in worker
+processes and merged into one dictionary, with per shard progress and failures reported
+"""
+
+def column(i: int, ds_id: int, table_id: int):
+    return {
+        "id": i,
+        "name": f"column_{i % 40}",
+        "title": "title",
+        "description": "<p>description</p>",
+        "url": f"/attribute/{i}/",
+        "table_name": f"table_{table_id}",
+        "ds_id": ds_id,
+        "table_id": table_id,
+        "custom_fields": []
+    }
+
+if __name__ == "__main__":
+    # 3 datasources of 60 columns, the last one spread over table ids 0..99
+    columns = [column(i, ds_id=1 + i // 60, table_id=(i * 7) % 100) for i in range(180)]
+
+    assert Shard.split(3, 0, 100, 3) == [Shard(3, (0, 34)), Shard(3, (34, 68)), Shard(3, (68, 100))]
+    assert Shard(3, (0, 34)).params({"ds_id": 15, "limit": 10}) == {"ds_id": 3, "limit": 10, "table_id__gte": 0, "table_id__lt": 34}
+
+    with StubServer(columns, default_limit=10) as stub:
+        client = Client("token", base_url=stub.url)
+        shards = [1, 2, *Shard.split(3, 0, 100, 3)]
+
+        seen = []
+        dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, "test.json"))
+        report = crawl(client, dictionary, shards, processes=2, progress=seen.append)
+
+        assert not report.failed, report.failed
+        assert len(seen) == 5 and {r.shard for r in seen} == {Shard(1), Shard(2), *Shard.split(3, 0, 100, 3)}
+        assert report.records == 180 and report.summary.new == 180
+        assert sorted(r.id for r in dictionary.records()) == list(range(180))
+        assert all(r.fetch_seconds > 0 for r in report.shards)
+        assert len(dictionary.lookup("column_1")) == 5
+
+        # one request fails, that shard is reported and the others are still merged
+        stub.fail(404)
+        dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, "test.json"))
+        report = crawl(client, dictionary, shards, processes=2)
+
+        assert len(report.failed) == 1 and "404" in report.failed[0].error, report.failed  # type: ignore[operator]
+        assert len(dictionary.records()) == report.records < 180
+
+    os.remove("test.json")
@@ -0,0 +1,88 @@
+import multiprocessing
+import os
+import threading
+from multiprocessing import resource_tracker
+from alation_dict import Dictionary, Record, SharedSnapshot, Storage, StorageType
+
+"""
+Test to ensure a dictionary copied into shared memory answers the same lookups in the creating
+process, in processes attaching by name and in forked workers, and is freed by its creator
+"""
+
+def record(i: int):
+    return Record.model_construct(
+        id=i, name=f"column_{i % 50}", title=f"título {i}", description="shared boilerplate",
+        url=f"https://alation/attribute/{i}/", table_name=f"table_{i % 7}",
+        phi="Yes" if i % 3 == 0 else None, pii=None, page_status="Approved"
+    )
+
+def worker(name: str, results) -> None:
+    # attach by name, as an independently started worker would
+    with SharedSnapshot.attach(name) as snapshot:
+        results.put(("attached", (
+            len(snapshot),
+            sorted(r.id for r in snapshot.lookup("column_7")),
+            [r.id for r in snapshot.fuzzy_lookup("colum_12", threshold=80)][:1],
+            snapshot.get(300),
+        )))
+
+def inherited(results) -> None:
+    # forked workers can use the creator's snapshot directly
+    results.put(("inherited", sorted(r.id for r in shared.lookup("column_7"))))
+
+if __name__ == "__main__":
+    dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, "test.json"))
+    dictionary.add_many(record(i) for i in range(1, 1001))
+
+    shared = dictionary.share()
+    expected = sorted(r.id for r in dictionary.lookup("column_7"))
+    assert len(shared) == 1000 and sorted(r.id for r in shared.lookup("column_7")) == expected
+    assert shared.get(300) == dictionary.index[300]
+    assert shared.get(5000) is None
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+
+    processes = [context.Process(target=worker, args=(shared.name, results)) for _ in range(3)]
+    processes.append(context.Process(target=inherited, args=(results,)))
+    for p in processes:
+        p.start()
+    answers = [results.get(timeout=30) for _ in processes]
+    for p in processes:
+        p.join()
+        assert p.exitcode == 0
+
+    attached = [answer for kind, answer in answers if kind == "attached"]
+    assert len(attached) == 3 and all(answer == attached[0] for answer in attached)
+    count, ids, fuzzy, row = attached[0]
+    assert count == 1000 and ids == expected and row == dictionary.index[300]
+    assert fuzzy and fuzzy[0] % 50 == 12, fuzzy
+    assert ("inherited", expected) in answers
+
+    # attaching from many threads at once leaves the resource tracker as it found it
+    register = resource_tracker.register
+
+    def attach_many() -> None:
+        for _ in range(50):
+            with SharedSnapshot.attach(shared.name) as snapshot:
+                assert len(snapshot) == 1000
+
+    threads = [threading.Thread(target=attach_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert resource_tracker.register is register, "expected concurrent attaches to restore resource_tracker.register"
+
+    # workers detaching didn't free the segment, the creator closing does
+    with SharedSnapshot.attach(shared.name) as again:
+        assert len(again) == 1000
+    name = shared.name
+    shared.close()
+    try:
+        SharedSnapshot.attach(name)
+        raise AssertionError("expected the segment to be unlinked")
+    except FileNotFoundError:
+        pass
+
+    os.remove("test.json")
@@ -0,0 +1,48 @@
+import os
+from alation_dict import Dictionary, Record, Snapshot, Storage, StorageType
+
+"""
+Test to ensure the memory mapped snapshot answers the same lookups as the
+dictionary it was written from
+"""
+
+def record(id: int, name: str, phi: str | None = None):
+    return Record.model_construct(
+        id=id,
+        name=name,
+        title=f"título {id}",
+        description="shared boilerplate description",
+        url=f"https://alation.medcity.net/attribute/{id}/",
+        table_name=f"table_{id % 4}",
+        page_status="Approved",
+        phi=phi,
+        pii=None
+    )
+
+storage = Storage(StorageType.LOCAL_FILE, "test.json", snapshot=True)
+dictionary = Dictionary(storage)
+for i in (50, 3, 17, 8, 1000):
+    dictionary.add(record(i, "coid" if i % 2 == 0 else f"name_{i}", phi="Yes" if i == 8 else None))
+dictionary.add(record(17, "renamed"))
+dictionary.save()
+
+with storage.open_snapshot() as snapshot:
+    assert len(snapshot) == 5, "expected 5 records"
+    assert list(snapshot.records()) == sorted(dictionary.records(), key=lambda r: r.id), "expected every record in id order"
+    assert snapshot.names() == ("coid", "name_3", "renamed"), f"unexpected name table {snapshot.names()}"
+
+    for name in snapshot.names() + ("name_17", "missing"):
+        expected = sorted(dictionary.lookup(name), key=lambda r: r.id)
+        assert snapshot.lookup(name) == expected, f"expected {expected} got {snapshot.lookup(name)}"
+
+    assert snapshot.get(8) == dictionary.index[8], "expected get by id to match"
+    assert snapshot.get(9) is None, "expected missing id to return None"
+    assert snapshot.fuzzy_lookup("renamd", threshold=80) == dictionary.fuzzy_lookup("renamd", threshold=80), "expected same fuzzy result"
+
+empty = "test_empty.snap"
+Storage(StorageType.LOCAL_FILE, "test_empty").write_snapshot([])
+with Snapshot(empty) as snapshot:
+    assert len(snapshot) == 0 and snapshot.lookup("coid") == [] and snapshot.get(1) is None, "expected empty snapshot"
+
+for path in ("test.json", "test.json.snap", empty):
+    os.remove(path)
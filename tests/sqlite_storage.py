@@ -0,0 +1,43 @@
+import os
+from alation_dict import Dictionary, Record, Storage, StorageType
+
+"""
+Test to ensure the SQLite backend round trips records, upserts changes made after
+a save and answers name/table lookups directly from the database
+"""
+
+def record(id: int, name: str, table_name: str, title: str = "title"):
+    return Record.model_construct(
+        id=id,
+        name=name,
+        title=title,
+        description="description",
+        url=f"https://alation.medcity.net/attribute/{id}/",
+        table_name=table_name,
+        page_status="Approved",
+        phi=None,
+        pii="No"
+    )
+
+storage = Storage(StorageType.DB, "test.db")
+dictionary = Dictionary(storage)
+dictionary.add(record(1, "coid", "facility"))
+dictionary.add(record(2, "coid", "encounter"))
+dictionary.add(record(3, "admit_date", "encounter"))
+dictionary.save()
+
+dictionary.add(record(2, "coid", "encounter", title="new title"))
+dictionary.add(record(4, "discharge_date", "encounter"))
+dictionary.save()
+
+got = sorted(storage.lookup("coid"), key=lambda r: r.id)
+assert got == [record(1, "coid", "facility"), record(2, "coid", "encounter", title="new title")], f"unexpected lookup {got}"
+assert [r.id for r in sorted(storage.lookup_table("encounter"), key=lambda r: r.id)] == [2, 3, 4], "expected 3 encounter records"
+assert storage.lookup("missing") == [], "expected no records"
+
+reloaded = Dictionary(Storage(StorageType.DB, "test.db"))
+assert sorted(reloaded.records(), key=lambda r: r.id) == sorted(dictionary.records(), key=lambda r: r.id), "expected records to round trip"
+
+reloaded.storage.close()
+storage.close()
+os.remove("test.db")
@@ -0,0 +1,35 @@
+import json
+from alation_dict.jsonstream import iter_array
+
+"""
+Test to ensure the incremental JSON decoder yields the same values as json.loads
+regardless of where chunk boundaries fall
+"""
+
+values = [
+    {"id": 1, "name": "coid", "description": "<p>a [bracketed], \"quoted\" value</p>", "custom_fields": []},
+    {"id": 22, "name": "ünïcødé", "description": "line\nbreak \\ slash", "custom_fields": [{"field_id": 10030, "value": None}]},
+    12345,
+    -1.5e10,
+    "string",
+    True,
+    None,
+    [],
+    {},
+]
+text = json.dumps(values, ensure_ascii=False, indent=2)
+
+for size in (1, 2, 3, 7, 64, len(text)):
+    chunks = (text[i:i + size] for i in range(0, len(text), size))
+    got = list(iter_array(chunks))
+    assert got == values, f"chunk size {size}: expected {values} got {got}"
+
+assert list(iter_array(["  [ ]  "])) == [], "expected empty array to yield nothing"
+
+for broken in ("", "{}", "[1, 2", '[{"id": 1}'):
+    try:
+        list(iter_array([broken]))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(f"expected {broken!r} to raise")
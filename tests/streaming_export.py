@@ -0,0 +1,93 @@
+import csv
+import gzip
+import json
+import os
+from alation_dict import Client, Dictionary, Endpoint, ExportFormat, Record, Storage, StorageType, export
+from alation_dict.export import pa
+from alation_dict.stub import StubServer
+
+"""
+Test to ensure records stream to csv, ndjson (optionally compressed) and parquet in batches,
+with column projection, straight from Client.get or from a dictionary
+"""
+
+def records(n: int):
+    for i in range(1, n + 1):
+        yield Record.model_construct(
+            id=i, name=f"column_{i}", title="title", description='a "quoted", description',
+            url=f"https://alation/attribute/{i}/", table_name="table", phi=None, pii="No", page_status="Approved"
+        )
+
+# every field by default, csv matches the columns Record declares
+assert export(records(2500), "test.csv", batch_size=1000) == 2500
+with open("test.csv", newline="", encoding="utf-8") as f:
+    rows = list(csv.reader(f))
+assert rows[0] == list(Record.model_fields.keys())
+assert len(rows) == 2501 and rows[1][0] == "1" and rows[1][3] == 'a "quoted", description'
+
+# projection and compression inferred from the path
+assert export(records(2500), "test.ndjson.gz", columns=["id", "name"], batch_size=1000) == 2500
+with gzip.open("test.ndjson.gz", "rt", encoding="utf-8") as f:
+    lines = [json.loads(line) for line in f]
+assert len(lines) == 2500 and lines[-1] == {"id": 2500, "name": "column_2500"}
+
+# the input is consumed lazily, one batch at a time
+consumed = 0
+def counted():
+    global consumed
+    for record in records(50):
+        consumed += 1
+        yield record
+export(counted(), "test.jsonl", batch_size=10)
+assert consumed == 50
+
+try:
+    export(records(1), "test.csv", columns=["id", "nope"])
+except Exception as e:
+    assert "nope" in str(e)
+else:
+    raise AssertionError("expected unknown column error")
+
+try:
+    export(records(1), "test.txt")
+except Exception as e:
+    assert "infer" in str(e)
+else:
+    raise AssertionError("expected format error")
+
+# straight from the client, nothing is held in memory
+columns = [
+    {"id": i, "name": f"column_{i}", "title": "t", "description": "<p>d</p>", "url": f"/attribute/{i}/", "table_name": "table", "custom_fields": []}
+    for i in range(1, 31)
+]
+with StubServer(columns, default_limit=10) as stub:
+    client = Client("token", base_url=stub.url)
+    assert export(client.get(Endpoint.COLUMN, {"limit": 10}), "test.ndjson", columns=["id", "description"]) == 30
+with open("test.ndjson", encoding="utf-8") as f:
+    assert json.loads(f.readline()) == {"id": 1, "description": "d"}
+
+# the dictionary exports everything it holds, export_records keeps its csv behaviour
+dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, "test.json"))
+dictionary.add_many(records(5))
+assert dictionary.export("test.csv.bz2", columns=["id"]) == 5
+dictionary.export_records(dictionary.records(), "test.csv")
+with open("test.csv", newline="", encoding="utf-8") as f:
+    assert len(list(csv.reader(f))) == 6
+
+if pa is not None:
+    import pyarrow.parquet as pq
+    assert export(records(2500), "test.parquet", columns=["id", "phi"], batch_size=1000, compression="zstd") == 2500
+    table = pq.read_table("test.parquet")
+    assert table.num_rows == 2500 and table.column_names == ["id", "phi"]
+    os.remove("test.parquet")
+else:
+    try:
+        export(records(1), "test.out", format=ExportFormat.PARQUET)
+    except Exception as e:
+        assert "pyarrow" in str(e)
+    else:
+        raise AssertionError("expected missing pyarrow error")
+    assert not os.path.exists("test.out")
+
+for path in ("test.csv", "test.ndjson.gz", "test.jsonl", "test.ndjson", "test.json", "test.csv.bz2"):
+    os.remove(path)
@@ -0,0 +1,39 @@
+import os
+from alation_dict import Dictionary, Record, Storage, StorageType
+
+"""
+Test to ensure json and ndjson storage round trip records through the incremental
+reader, and that a lazy dictionary still answers fuzzy lookups
+"""
+
+records = [
+    Record.model_construct(
+        id=i,
+        name=f"column_{i}",
+        title="title, with [brackets]",
+        description=f"description {i} \"quoted\"\nmulti line",
+        url=f"https://alation.medcity.net/attribute/{i}/",
+        table_name="table_name",
+        page_status="Approved",
+        phi=None,
+        pii="No"
+    )
+    for i in range(1, 501)
+]
+
+for path in ("test.json", "test.ndjson"):
+    storage = Storage(StorageType.LOCAL_FILE, path)
+    assert list(storage.read()) == [], f"{path}: expected a new file to be empty"
+
+    storage.write(records)
+    assert list(storage.read()) == records, f"{path}: expected records to round trip"
+
+    with open(path, encoding="utf-8") as f:
+        first = f.read(1)
+    assert (first == "[") == (path == "test.json"), f"{path}: unexpected file format"
+
+    lazy = Dictionary(storage, lazy=True)
+    assert lazy.lookup("column_7") == [records[6]], f"{path}: expected direct lookup to work"
+    assert lazy.fuzzy_lookup("column_42", threshold=95) == [records[41]], f"{path}: expected fuzzy lookup to work"
+
+    os.remove(path)
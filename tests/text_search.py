@@ -0,0 +1,71 @@
+import os
+from alation_dict import Dictionary, Record, Storage, StorageType
+
+"""
+Test to ensure full text search ranks records by title/description relevance,
+supports phrase and prefix queries, follows add() and survives a reload
+"""
+
+def record(id: int, title: str, description: str):
+    return Record.model_construct(
+        id=id,
+        name=f"column_{id}",
+        title=title,
+        description=description,
+        url=f"https://alation.medcity.net/attribute/{id}/",
+        table_name="encounter",
+        page_status="Approved",
+        phi=None,
+        pii=None
+    )
+
+storage = Storage(StorageType.LOCAL_FILE, "test.json", snapshot=True)
+dictionary = Dictionary(storage)
+dictionary.add_many([
+    record(1, "Admit Date", "Date the patient was admitted to the facility."),
+    record(2, "Discharge Date", "Date the patient was discharged. Not the admit date."),
+    record(3, "Facility Id", "Identifier of the facility."),
+    record(4, "Patient Admit Date", "Patient admit date in local time, the date of the admit event."),
+    record(5, "Admission Source", "Where the admission originated."),
+])
+
+def ids(query: str, limit: int = 10) -> list[int]:
+    return [hit.record.id for hit in dictionary.search(query, limit)]
+
+def ids_in(dictionary: Dictionary, query: str) -> list[int]:
+    return [hit.record.id for hit in dictionary.search(query)]
+
+assert ids("patient admit date")[0] == 4, f"expected the most relevant record first, got {ids('patient admit date')}"
+assert set(ids("facility")) == {1, 3}, "expected both facility records"
+assert set(ids('"admit date"')) == {1, 2, 4}, "expected only records containing the phrase"
+assert set(ids('"date admit"')) == set(), "expected phrase order to matter"
+assert set(ids("admi*")) == {1, 2, 4, 5}, "expected prefix to match admit and admission"
+assert ids("nothing matches this") == [], "expected no results"
+assert len(ids("date", limit=2)) == 2, "expected limit to be honored"
+
+# updates are picked up without a rebuild
+dictionary.add(record(3, "Facility Id", "Identifier of the hospital."))
+assert ids("hospital") == [3] and set(ids("facility")) == {1, 3}, "expected updated description to be indexed"
+
+dictionary.save()
+assert os.path.exists("test.json.search"), "expected search index to be saved alongside the snapshot"
+
+reloaded = Dictionary(Storage(StorageType.LOCAL_FILE, "test.json", snapshot=True))
+assert [hit.record for hit in reloaded.search("patient admit date")] == [hit.record for hit in dictionary.search("patient admit date")], (
+    "expected reloaded index to rank the same way"
+)
+
+# changes made after a reload, before the first search, reach the saved index
+reloaded.add(record(6, "Discharge Date", "Date the patient left the hospital."))
+reloaded.add(record(4, "Patient Visit Date", "Patient visit date in local time."))
+assert set(ids_in(reloaded, "hospital")) == {3, 6}, "expected records added after a reload to be searchable"
+assert 4 not in ids_in(reloaded, "admit"), "expected records updated after a reload to be reindexed"
+
+reloaded.save()
+reloaded = Dictionary(Storage(StorageType.LOCAL_FILE, "test.json", snapshot=True))
+reloaded.remove(6)
+assert ids_in(reloaded, "hospital") == [3], "expected records removed after a reload to leave the index"
+assert ids_in(reloaded, "visit") == [4], "expected the saved index to hold changes made before the save"
+
+for path in ("test.json", "test.json.snap", "test.json.search"):
+    os.remove(path)
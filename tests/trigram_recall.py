@@ -0,0 +1,68 @@
+import os
+import random
+from rapidfuzz import fuzz, process
+from alation_dict import Dictionary, Record, Storage, StorageType
+
+"""
+Test to ensure trigram candidate pruning in fuzzy_lookup finds the same best match
+as scoring every name, and reports the recall against the exhaustive scan
+"""
+
+random.seed(7)
+words = [
+    "patient", "admit", "discharge", "date", "dt", "id", "coid", "facility", "encounter", "type",
+    "code", "desc", "amount", "total", "charge", "payer", "plan", "provider", "npi", "dept",
+    "unit", "bed", "room", "status", "flag", "start", "end", "time", "ts", "mrn", "dx", "px",
+]
+names = sorted({"_".join(random.sample(words, random.randint(2, 4))) for _ in range(4000)})
+
+def perturb(name: str) -> str:
+    chars = list(name)
+    match random.randint(0, 3):
+        case 0:
+            del chars[random.randrange(len(chars))]
+        case 1:
+            chars.insert(random.randrange(len(chars)), random.choice("aeiou"))
+        case 2:
+            i = random.randrange(len(chars) - 1)
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+        case _:
+            return name.upper().replace("_", " ")
+    return "".join(chars)
+
+dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, "test.json"))
+dictionary.add_many(
+    Record.model_construct(
+        id=i,
+        name=name,
+        title="title",
+        description="description",
+        url="https://url.com",
+        table_name="table_name",
+        page_status="status",
+        phi=None,
+        pii=None
+    )
+    for i, name in enumerate(names)
+)
+
+queries = [perturb(name) for name in random.sample(names, 300)]
+hits = 0
+for query in queries:
+    best, best_score, _ = process.extractOne(query, names, scorer=fuzz.WRatio)
+    got = dictionary.fuzzy_lookup(query, threshold=0)
+    if got and fuzz.WRatio(query, got[0].name) == best_score:
+        hits += 1
+
+recall = hits / len(queries)
+print(f"recall vs exhaustive scan: {recall:.3f} ({hits}/{len(queries)})")
+assert recall >= 0.95, f"expected recall >= 0.95 got {recall:.3f}"
+
+# names added or renamed after the index is built are picked up incrementally
+dictionary.add(Record.model_construct(
+    id=len(names), name="zebra_crossing_signal", title="title", description="description",
+    url="https://url.com", table_name="table_name", page_status="status", phi=None, pii=None
+))
+assert [r.id for r in dictionary.fuzzy_lookup("zebra_crosing_signal", threshold=90)] == [len(names)], "expected new name to be found"
+
+os.remove("test.json")
@@ -0,0 +1,101 @@
+import os
+import threading
+from alation_dict import Dictionary, Record, Storage, StorageType
+from alation_dict.versioned import BUCKETS
+
+"""
+Test to ensure a versioned dictionary publishes immutable views once per batch, old views are
+unaffected by later writes, untouched buckets are shared and readers never see a half applied batch
+"""
+
+def record(i: int, name: str):
+    return Record.model_construct(
+        id=i, name=name, title="title", description="description",
+        url=f"https://alation/attribute/{i}/", table_name="table", phi=None, pii=None, page_status=None
+    )
+
+path = "test.json"
+dictionary = Dictionary(Storage(StorageType.LOCAL_FILE, path), versioned=True)
+empty = dictionary.snapshot()
+assert len(empty) == 0 and empty.version == 0
+
+# one version per batch
+dictionary.add_many(record(i, f"column_{i}") for i in range(1, 1001))
+first = dictionary.snapshot()
+assert first.version == 1 and len(first) == 1000
+assert [r.id for r in first.lookup("column_7")] == [7]
+assert [r.id for r in first.fuzzy_lookup("colum_42", threshold=80)] == [42]
+assert len(empty) == 0 and empty.lookup("column_7") == []
+
+# writes inside a batch are invisible until it closes
+with dictionary.batch():
+    dictionary.add(record(7, "renamed"))
+    dictionary.remove(8)
+    dictionary.add(record(1001, "column_1001"))
+    assert dictionary.snapshot() is first
+
+second = dictionary.snapshot()
+assert second.version == 2 and len(second) == 1000
+assert second.lookup("column_7") == [] and [r.id for r in second.lookup("renamed")] == [7]
+assert second.get(8) is None and second.get(1001) is not None
+assert "renamed" in second.names() and "column_8" not in second.names()
+
+# the previous version is untouched
+assert [r.id for r in first.lookup("column_7")] == [7] and first.get(8) is not None and first.get(1001) is None
+
+# only the touched buckets were copied
+touched = {7 % BUCKETS, 8 % BUCKETS, 1001 % BUCKETS}
+assert all(first._ids[b] is second._ids[b] for b in range(BUCKETS) if b not in touched)
+assert all(first._ids[b] is not second._ids[b] for b in touched)
+
+# single writes outside a batch publish immediately, unchanged writes don't
+dictionary.add(record(2, "column_2"))
+assert dictionary.snapshot() is second
+dictionary.add(record(2, "other"))
+assert dictionary.snapshot().version == 3
+
+# readers running alongside a writer that keeps renaming every record between two names
+# must always see all of them under exactly one name
+ids = range(1, 201)
+shared = Dictionary(Storage(StorageType.LOCAL_FILE, "test_shared.json"), versioned=True)
+shared.add_many(record(i, "a") for i in ids)
+
+stop = threading.Event()
+errors: list[str] = []
+
+def read():
+    while not stop.is_set():
+        view = shared.snapshot()
+        a, b = len(view.lookup("a")), len(view.lookup("b"))
+        if sorted((a, b)) != [0, len(ids)]:
+            errors.append(f"inconsistent view {view.version}: a={a} b={b}")
+            return
+
+readers = [threading.Thread(target=read) for _ in range(3)]
+for t in readers:
+    t.start()
+for n in range(50):
+    shared.add_many(record(i, "b" if n % 2 == 0 else "a") for i in ids)
+stop.set()
+for t in readers:
+    t.join()
+assert not errors, errors[0]
+assert shared.snapshot().version == 51
+
+try:
+    Dictionary(Storage(StorageType.LOCAL_FILE, "test_compact.json"), compact=True, versioned=True)
+except Exception as e:
+    assert "versioned" in str(e)
+else:
+    raise AssertionError("expected compact + versioned to be rejected")
+
+try:
+    Dictionary(Storage(StorageType.LOCAL_FILE, "test_compact.json")).snapshot()
+except Exception as e:
+    assert "versioned" in str(e)
+else:
+    raise AssertionError("expected snapshot() to require versioned=True")
+
+for p in (path, "test_shared.json", "test_compact.json"):
+    if os.path.exists(p):
+        os.remove(p)